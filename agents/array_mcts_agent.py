@@ -0,0 +1,173 @@
+from random import shuffle
+
+from agents.array_tree import ArrayTree
+from agents.mcts_agent import MCTSAgent
+
+
+class ArrayMCTSAgent(MCTSAgent):
+    """
+    MCTSAgent variant that stores its game tree in an ArrayTree.
+
+    The stages of a run are the same as MCTSAgent, but nodes are indices 
+    into the arrays of the tree and edges are action indices rather than 
+    action objects.  Each node costs tens of bytes instead of a Python 
+    object with its own children dictionary.
+
+    When a node is first expanded the children for all of its legal actions 
+    are allocated at once, then visited one per run in a random order.  
+    With a node limit, a node is left unexpanded when its children do not 
+    fit in the tree.
+
+    The options of MCTSAgent that need per-node data ArrayTree does not 
+    store are not supported, see UNSUPPORTED_OPTIONS.
+    """
+
+    UNSUPPORTED_OPTIONS = {"transposition_table_size" : "transposition tables", 
+                            "rave_equivalence" : "RAVE", 
+                            "widening_exponent" : "progressive widening", 
+                            "sequential_halving" : "sequential halving", 
+                            "tree_file" : "tree files"}
+
+    def __init__(self, agent_id, use_gui, **kwargs):
+        """
+        Run the MCTSAgent initializer with the given options.
+
+        Raises a RuntimeError if one of UNSUPPORTED_OPTIONS is set.
+        """
+        for option, feature in self.UNSUPPORTED_OPTIONS.items():
+            if kwargs.get(option) is not None:
+                raise RuntimeError("ArrayMCTSAgent does not support {}.".format(feature))
+        super().__init__(agent_id, use_gui, **kwargs)
+
+    def _reset(self):
+        self.tree = ArrayTree(max_nodes = self.max_nodes)
+        self.max_depth = 0
+
+        self.playout_total = 0
+        self.action_node = None
+
+    def _root_solved(self):
+        """
+        ArrayTree nodes are not solved, search always runs for the allotted 
+        time.
+        """
+        return False
+
+    def _max_trials_action(self, state):
+        """
+        Return the action from the root with the most trials, or a random 
+        action if the root's children do not fit in the tree.
+        """
+        max_child = self.tree.max_trials_child(self.tree.root)
+        if max_child == -1:
+            # debug info
+            self.action_node = None
+            return state.generate_random_action()
+        # debug info
+        self.action_node = max_child
+        return state.action_from_index(self.tree.action_index[max_child])
+
+    def root_statistics(self):
+        tree = self.tree
+        first_child = tree.first_child[tree.root]
+        children = range(first_child, first_child + tree.num_expanded[tree.root])
+        return {int(tree.action_index[child]) : (int(tree.trials[child]), 
+                                                    int(tree.wins[child]))
+                    for child in children}
+
+    def _take_action(self, action):
+        """
+        Move the tree root to the child node of the current root corresponding
+        to the action.
+
+        If a node for that action has never been visited, restart the tree 
+        from scratch.  Otherwise the tree is compacted, reclaiming the nodes 
+        outside of the new root's subtree.
+        """
+        child = self.tree.find_child(self.tree.root, action.to_index())
+        if child == -1:
+            self.tree.reset()
+            self.max_depth = 0
+        else:
+            self.tree.set_root(child)
+            self.tree.compact()
+            self.max_depth = max(0, self.max_depth - 1)
+
+    def _selection(self, state):
+        """
+        Progress through the tree, starting at the root, until a node is 
+        found that is unexpanded or has unvisited children.
+
+        Uses the UCT algorithm to determine which nodes to progress to.
+
+        Returns the path of nodes from the root to the selected node.
+        """
+        tree = self.tree
+        node = tree.root
+        path = [node]
+        while tree.is_expanded(node):
+            node = tree.uct_child(node)
+            path.append(node)
+            state.take_action(state.action_from_index(tree.action_index[node]))
+        return path
+
+    def _expansion(self, state, node):
+        """
+        Visit the next unvisited child of the node, progressing the game 
+        state by its action.
+
+        Allocates the node's children first if the node is unexpanded.  If 
+        they do not fit within the tree's maximum number of nodes, the node 
+        is not expanded.
+        """
+        new_child = node
+        tree = self.tree
+        unexpanded = tree.num_children[node] == 0
+        if (not state.is_terminal() 
+                and (not unexpanded or tree.has_room(state.num_legal_actions()))):
+            if unexpanded:
+                action_indices = [action.to_index() 
+                                    for action in state.get_legal_actions()]
+                shuffle(action_indices)
+                tree.add_children(node, action_indices, state.current_agent_id)
+
+            new_child = tree.expand_next_child(node)
+            action_index = tree.action_index[new_child]
+            state.take_action(state.action_from_index(action_index))
+
+        return new_child
+
+    def _backpropagation(self, winning_id, path):
+        """
+        Update the nodes from the end of the path to the root, following 
+        the parent links of the tree.
+        """
+        self.tree.backpropagate(path[-1], winning_id)
+
+    def _batch_backpropagation(self, results, path):
+        self.tree.backpropagate_results(path[-1], results)
+
+    def _add_to_tree_stats(self, path):
+        self.max_depth = max(self.max_depth, len(path) - 1)
+
+    def tree_stats(self):
+        """
+        Return the statistics of MCTSAgent.tree_stats for the ArrayTree.
+
+        Every allocated node is counted, including unvisited children.  The 
+        max depth is only lowered by one when the root moves down the tree, 
+        so it is an upper bound after the first action.
+        """
+        num_nodes = len(self.tree)
+        return {"max_depth" : self.max_depth, 
+                "num_nodes" : num_nodes, 
+                "memory_bytes" : num_nodes * self.tree.bytes_per_node()}
+
+    def action_win_rate(self):
+        win_rate = 0
+        if self.action_node is not None:
+            win_rate = self.tree.value_estimate(self.action_node)
+        return win_rate
+
+    def __str__(self):
+        return "playouts {} | node win rate {:.2%} | tree nodes {}".format(self.playout_total, self.action_win_rate(), len(self.tree))
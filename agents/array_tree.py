@@ -0,0 +1,241 @@
+from math import log, sqrt
+
+import numpy as np
+
+
+class ArrayTree:
+    """
+    A Monte Carlo search tree stored as a struct of arrays.
+
+    Each node is an index into a set of preallocated NumPy arrays, one array
+    per node attribute:
+
+        parent          -   index of the parent node, -1 for the root
+        first_child     -   index of the first child node, -1 if unexpanded
+        num_children    -   number of children, one per legal action
+        num_expanded    -   number of children that have been visited
+        action_index    -   Action.to_index of the action leading to the node
+        agent_id        -   agent that chose the action leading to the node
+        trials          -   number of playouts through the node
+        wins            -   number of those playouts won by agent_id
+
+    The children of a node are allocated together in one contiguous block
+    when the node is first expanded, in a random order.  They are then
+    visited in block order, so the first num_expanded children of a node are
+    the ones that have been visited.
+
+    The arrays double in size whenever they run out of room, up to an 
+    optional maximum number of nodes.  After the root moves down the tree, 
+    compact moves the nodes still reachable from it to the front of the 
+    arrays, freeing the space of every other node.  Selection,
+    expansion, and backpropagation only perform arithmetic on node indices,
+    there is no per-node Python object.
+    """
+
+    INITIAL_CAPACITY = 1024
+    EXPLORATION_PARAM = sqrt(2)
+
+    _DTYPES = [("parent", np.int32), ("first_child", np.int32),
+                ("num_children", np.int32), ("num_expanded", np.int32),
+                ("action_index", np.int32), ("agent_id", np.int8),
+                ("trials", np.float64), ("wins", np.float64)]
+
+    def __init__(self, capacity = INITIAL_CAPACITY, max_nodes = None):
+        self.capacity = capacity
+        self.max_nodes = max_nodes
+        for name, dtype in self._DTYPES:
+            setattr(self, name, np.zeros(capacity, dtype = dtype))
+        self.reset()
+
+    def reset(self):
+        """
+        Discard every node, leaving only a new root.
+        """
+        self.size = 0
+        self.root = self._allocate(1, -1, -1, -1)
+
+    @classmethod
+    def bytes_per_node(cls):
+        return sum([np.dtype(dtype).itemsize for _, dtype in cls._DTYPES])
+
+    def add_children(self, node, action_indices, agent_id):
+        """
+        Allocate the block of children of an unexpanded node, one for each
+        action index.
+        """
+        num_children = len(action_indices)
+        first_child = self._allocate(num_children, node, agent_id,
+                                        action_indices)
+        self.first_child[node] = first_child
+        self.num_children[node] = num_children
+        self.num_expanded[node] = 0
+
+    def has_room(self, num_nodes):
+        """
+        Return a boolean indicating if num_nodes more nodes fit within the 
+        maximum number of nodes.
+        """
+        return self.max_nodes is None or self.size + num_nodes <= self.max_nodes
+
+    def expand_next_child(self, node):
+        """
+        Mark the next unvisited child of the node as visited and return it.
+        """
+        child = self.first_child[node] + self.num_expanded[node]
+        self.num_expanded[node] += 1
+        return child
+
+    def is_expanded(self, node):
+        """
+        Return a boolean indicating if the node has children and all of them
+        have been visited.
+        """
+        num_children = self.num_children[node]
+        return num_children > 0 and self.num_expanded[node] == num_children
+
+    def uct_child(self, node):
+        """
+        Return the child of the node with the highest UCT value, see
+        MCTSAgent.Node.UCT.
+
+        The values of every child are computed at once over the contiguous
+        slices of the wins and trials arrays.  Ties go to the first child, as
+        in the per-child loop.
+        """
+        first_child = self.first_child[node]
+        end = first_child + self.num_children[node]
+        children_trials = self.trials[first_child:end]
+
+        values = (self.wins[first_child:end] / children_trials
+                    + self.EXPLORATION_PARAM 
+                        * np.sqrt(log(self.trials[node]) / children_trials))
+        return first_child + int(np.argmax(values))
+
+    def max_trials_child(self, node):
+        """
+        Return the visited child of the node with the most trials, or -1 if 
+        no child has been visited.
+        """
+        first_child = self.first_child[node]
+        children_trials = self.trials[first_child:first_child + self.num_expanded[node]]
+        max_child = -1
+        if len(children_trials):
+            max_child = first_child + int(np.argmax(children_trials))
+        return max_child
+
+    def find_child(self, node, action_index):
+        """
+        Return the visited child of the node reached by the action index, or
+        -1 if there is none.
+        """
+        first_child = self.first_child[node]
+        children_actions = self.action_index[first_child:first_child + self.num_expanded[node]]
+        matches = np.flatnonzero(children_actions == action_index)
+
+        child = -1
+        if matches.size > 0:
+            child = first_child + int(matches[0])
+        return child
+
+    def backpropagate(self, node, winning_id):
+        """
+        Update the nodes from node to the root with the simulation result.
+        """
+        while node != -1:
+            if winning_id is not None and self.agent_id[node] == winning_id:
+                self.wins[node] += 1
+            self.trials[node] += 1
+            node = self.parent[node]
+
+    def backpropagate_results(self, node, results):
+        """
+        Update the nodes from node to the root with a Counter of simulation 
+        results.
+        """
+        num_results = sum(results.values())
+        while node != -1:
+            self.wins[node] += results.get(int(self.agent_id[node]), 0)
+            self.trials[node] += num_results
+            node = self.parent[node]
+
+    def set_root(self, node):
+        """
+        Make the node the root of the tree.
+
+        The ancestors and siblings of the node remain allocated until the
+        tree is compacted or reset.
+        """
+        self.parent[node] = -1
+        self.root = node
+
+    def compact(self):
+        """
+        Move the nodes reachable from the root to the front of the arrays in 
+        breadth first order, discarding every other node.
+
+        Each block of children stays contiguous, so node indices are remapped 
+        but the structure of the tree is unchanged.
+        """
+        order = [self.root]     # new index -> old index
+        for node in order:
+            num_children = self.num_children[node]
+            if num_children > 0:
+                first_child = self.first_child[node]
+                order.extend(range(first_child, first_child + num_children))
+
+        order = np.array(order)
+        new_index = np.full(self.size, -1, dtype = np.int32)
+        new_index[order] = np.arange(order.size)
+        for name, _ in self._DTYPES:
+            array = getattr(self, name)
+            array[:order.size] = array[order]
+
+        self.size = order.size
+        self.root = 0
+        parent = self.parent[1:self.size]
+        parent[:] = new_index[parent]
+        first_child = self.first_child[:self.size]
+        has_children = first_child != -1
+        first_child[has_children] = new_index[first_child[has_children]]
+
+    def value_estimate(self, node):
+        return self.wins[node] / self.trials[node]
+
+    def _allocate(self, num_nodes, parent, agent_id, action_indices):
+        """
+        Allocate a contiguous block of new nodes, returning the index of the
+        first one.
+        """
+        start = self.size
+        end = start + num_nodes
+        if end > self.capacity:
+            self._grow(end)
+
+        self.parent[start:end] = parent
+        self.first_child[start:end] = -1
+        self.num_children[start:end] = 0
+        self.num_expanded[start:end] = 0
+        self.action_index[start:end] = action_indices
+        self.agent_id[start:end] = agent_id
+        self.trials[start:end] = 0
+        self.wins[start:end] = 0
+
+        self.size = end
+        return start
+
+    def _grow(self, min_capacity):
+        """
+        Double the capacity of the arrays until they fit min_capacity nodes.
+        """
+        capacity = self.capacity
+        while capacity < min_capacity:
+            capacity *= 2
+
+        for name, dtype in self._DTYPES:
+            new_array = np.zeros(capacity, dtype = dtype)
+            new_array[:self.size] = getattr(self, name)[:self.size]
+            setattr(self, name, new_array)
+        self.capacity = capacity
+
+    def __len__(self):
+        return self.size
@@ -5,7 +5,7 @@ from willsmith.gui_display_controller import GUIDisplayController
 
 class MCTSDisplay(GUIDisplayController):
     """
-    The display controller for MCTSAgent.
+    The display controller for MCTSAgent and its variants.
 
     Creates a Tkinter GUI that displays some stats about the agent's latest 
     moves.
@@ -25,12 +25,14 @@ class MCTSDisplay(GUIDisplayController):
         self.action_label = None
         self.win_pct_label = None
         self.depth_label = None
+        self.nodes_label = None
 
     def _initialize_widgets(self):
         self.playouts_label = self._create_label()
         self.action_label = self._create_label()
         self.win_pct_label = self._create_label()
         self.depth_label = self._create_label()
+        self.nodes_label = self._create_label()
 
     def _create_label(self):
         return Label(self.root, font = self.LABEL_FONT, 
@@ -42,6 +44,7 @@ class MCTSDisplay(GUIDisplayController):
         self.action_label.grid(row = 1, column = 0)
         self.win_pct_label.grid(row = 2, column = 0)
         self.depth_label.grid(row = 3, column = 0)
+        self.nodes_label.grid(row = 4, column = 0)
 
     def _update_display(self, agent, action):
         self._update_labels_from_agent(agent, action)
@@ -52,8 +55,8 @@ class MCTSDisplay(GUIDisplayController):
     def _update_labels_from_agent(self, agent, action):
         self.action_label["text"] = "Latest action:\n{}".format(action)
         self.playouts_label["text"] = "Latest playout count:\n{}".format(agent.playout_total)
-        win_pct = 0
-        if agent.action_node is not None:
-            win_pct = agent.action_node.value_estimate()
-        self.win_pct_label["text"] = "Node sim win rate:\n{:.2%}".format(win_pct)
-        self.depth_label["text"] = "Node tree depth:\n{}".format(agent.root.depth())
+        self.win_pct_label["text"] = "Node sim win rate:\n{:.2%}".format(agent.action_win_rate())
+        tree_stats = agent.tree_stats()
+        self.depth_label["text"] = "Node tree depth:\n{}".format(tree_stats["max_depth"])
+        self.nodes_label["text"] = "Node tree size:\n{} ({:.1f} MB)".format(tree_stats["num_nodes"], 
+                                                                        tree_stats["memory_bytes"] / 2 ** 20)
@@ -1,10 +1,18 @@
-from math import log, sqrt
-from random import choice
+from collections import Counter
+from math import ceil, inf, log, sqrt
+from os.path import exists
+from random import choice, sample
+from sys import getsizeof
+from threading import Thread
 from time import time
 
 from agents.displays.mcts_display import MCTSDisplay
+from agents.node_pool import NodePool
+from agents.time_manager import TimeManager
+from agents.tree_file import load_tree, save_tree
+from agents.transposition_table import TranspositionTable
 
-from willsmith.agent import Agent
+from willsmith.agent import Agent, SearchSnapshot
 
 
 class MCTSAgent(Agent):
@@ -20,28 +28,186 @@ class MCTSAgent(Agent):
         Simulation      -   Play out game until reaching a terminal state
         Backpropagation -   Update win/trial counters for new node and all parents
 
-    Then, it chooses the action with the most trials and returns that.
+    Then, it chooses the action with the most trials and returns that.  The 
+    search ends early when that action can no longer be overtaken, and is 
+    skipped when there is only one legal action, see TimeManager.
 
     The agents internal game state is stored as a tree of nodes, where the
     edges are actions and the nodes are the wins/total trials from the
     perspective of the agent they represent.
+
+    With a transposition table, nodes are also stored by the Zobrist key of 
+    their state, and expansion reuses the stored node when a different move 
+    order reaches the same state.  The tree becomes a directed acyclic 
+    graph, so backpropagation follows the path taken by the run rather 
+    than parent links.
+
+    With RAVE enabled, each node also keeps all-moves-as-first statistics: 
+    the results of every run in which its action was played by the same 
+    agent at any later point of the run, not only at this point.  These are 
+    blended into the UCT value of the node, with a weight that decreases as 
+    the node gains trials of its own, see Node.UCT.
+
+    With progressive widening, a node only considers its first 
+    ceil((trials + 1) ** widening_exponent) actions, in the order given by 
+    the game's move-ordering heuristic, see Game.ordered_legal_actions.  The 
+    search can then descend below nodes with many legal actions before all 
+    of them have been tried.
+
+    Nodes whose outcome is certain are solved, as in MCTS-Solver.  Terminal 
+    nodes are proven wins or losses for the agent that chose them, and 
+    backpropagation proves their ancestors:  a node is a loss when the next 
+    agent has a proven winning child, and a win when every one of its 
+    actions has a proven losing child.  Selection skips solved children, and 
+    search ends as soon as the root is solved.  Proofs assume two players 
+    alternating turns.
+
+    With pondering, the agent keeps running playouts from the current root 
+    in a background thread during the other agent's turn, and stops when 
+    the other agent's action is taken.  The subtree of that action is then 
+    kept as usual.  Threads only run in parallel on free-threaded builds of 
+    Python, on builds with the GIL the pondering thread shares the CPU with 
+    the agent that is searching.
+
+    With a node limit, nodes come from a NodePool.  The tree stops growing 
+    once the limit is reached, playouts then start from the selected node 
+    without expanding it.  When the root moves down the tree, the rest of 
+    the old tree is returned to the pool for reuse.
+
+    With a tree file, the first TREE_FILE_PLIES plies of the tree are saved 
+    at the end of every game, or as soon as the root moves past them, and 
+    loaded at the start of the next game.  The agent starts each game with 
+    the opening statistics of all of its previous games, see 
+    agents.tree_file.
+
+    With leaf_playouts above one, each run simulates that many playouts from 
+    the new leaf instead of one, and backpropagates all of their results in 
+    a single pass.  Selection, expansion and backpropagation are then shared 
+    by several playouts.
+
+    With a playout policy, simulations choose their actions with the 
+    policy instead of uniformly at random, learning from the earlier runs 
+    of the search, see agents.playout_policy.
+
+    With sequential halving, search spreads its playouts evenly over a few 
+    candidate root actions instead of following UCT at the root, as in 
+    Gumbel MuZero.  The candidates are a random sample of the legal 
+    actions, or the first ones in the move ordering with progressive 
+    widening.  The search is split into rounds, each giving every remaining 
+    candidate an equal share of playouts below it, after which the weaker 
+    half of the candidates is dropped.  Below the root, runs still use UCT.  
+    This spends fewer playouts on actions that are clearly worse, which 
+    suits small budgets.
     """
 
     GUI_DISPLAY = MCTSDisplay
+    TREE_FILE_PLIES = 4
 
-    def __init__(self, agent_id, use_gui):
+    def __init__(self, agent_id, use_gui, transposition_table_size = None, 
+                    rave_equivalence = None, widening_exponent = None, 
+                    ponder = False, time_bank = None, playout_budget = None, 
+                    max_nodes = None, tree_file = None, leaf_playouts = 1, 
+                    playout_policy = None, sequential_halving = None):
         """
         Run the Agent initializer and start the gametree.
 
+        transposition_table_size is the maximum number of states stored in 
+        the transposition table, which is disabled when it is None.
+
+        rave_equivalence is the number of trials at which a node's own value 
+        and its RAVE value are weighted equally, RAVE is disabled when it is 
+        None.
+
+        widening_exponent controls how fast the number of actions considered 
+        at a node grows with its trials, progressive widening is disabled 
+        when it is None.
+
+        ponder enables searching during the other agent's turn.
+
+        time_bank is the total number of seconds the agent may search for in 
+        a game.  Each search is limited to the smaller of its allotted time 
+        and a share of the remaining bank, see TimeManager.
+
+        playout_budget is a fixed number of playouts for each search, used 
+        instead of the allotted time when it is not None.  Each playout adds 
+        at most one node, so it also bounds the nodes added by a search.  
+        With a seeded random module and without pondering, searches with a 
+        playout budget are reproducible.
+
+        max_nodes is the maximum number of nodes in the tree, which is 
+        unlimited when it is None.  A node limit cannot be combined with a 
+        transposition table, since released nodes could still be reachable 
+        from other parents.
+
+        tree_file is the path of the file the opening tree is saved to and 
+        loaded from, if any.  It cannot be combined with a node limit, since 
+        the opening tree is kept while the root moves down.
+
+        leaf_playouts is the number of playouts simulated from each new leaf, 
+        at least 1.
+
+        playout_policy is the PlayoutPolicy used by simulations, which are 
+        light playouts when it is None.  Its tables are cleared whenever the 
+        root moves.
+
+        sequential_halving is the number of root actions search starts 
+        sequential halving with, which is disabled when it is None.  It must 
+        be at least 2, so that there is a candidate to drop.  iter_search 
+        and pondering always use UCT.
+
         Also initialize debug attributes for use in logging.
         """
         super().__init__(agent_id, use_gui)
+        self.rave_equivalence = rave_equivalence
+        self.widening_exponent = widening_exponent
+        self.ponder_enabled = ponder
+        self._ponder_thread = None
+        self._stop_requested = False
+        self.time_manager = TimeManager(time_bank)
+        self.playout_budget = playout_budget
+        self.max_nodes = max_nodes
+        self.node_pool = None
+        if max_nodes is not None:
+            if transposition_table_size is not None:
+                raise RuntimeError("Node limit cannot be used with a transposition table.")
+            self.node_pool = NodePool(max_nodes, self.Node)
+        self.tree_file = tree_file
+        if tree_file is not None and max_nodes is not None:
+            raise RuntimeError("Tree file cannot be used with a node limit.")
+        self.opening_root = None
+        self.load_pending = False
+        if leaf_playouts < 1:
+            raise RuntimeError("Leaf playouts must be positive.")
+        self.leaf_playouts = leaf_playouts
+        self.playout_policy = playout_policy
+        if sequential_halving is not None and sequential_halving < 2:
+            raise RuntimeError("Sequential halving needs at least two candidates.")
+        self.sequential_halving = sequential_halving
+        self.root_action = None
+        self.scratch_state = None
+        self.transpositions = None
+        if transposition_table_size is not None:
+            self.transpositions = TranspositionTable(transposition_table_size)
         self._reset()
 
     def _reset(self):
-        self.root = self.Node(None, None)
+        if self.opening_root is not None and self.opening_root.has_children():
+            self._save_opening_tree()
+
+        if self.node_pool is not None:
+            self.node_pool.clear()
+        self.root = self._new_node(None, None)
+        if self.transpositions is not None:
+            self.transpositions.clear()
+
+        self.root_ply = 0
+        self.load_pending = self.tree_file is not None and exists(self.tree_file)
+        if self.tree_file is not None:
+            self.opening_root = self.root
 
         self.playout_total = 0
+        self.ponder_total = 0
+        self.search_time = 0
         self.action_node = None
 
     def search(self, state, allotted_time):
@@ -52,25 +218,326 @@ class MCTSAgent(Agent):
 
         Searches the state space for the best available action, using the above
         steps.
+
+        The state may be a read-only StateView.  Playouts run on the agent's 
+        scratch state, refilled from it only if there is more than one legal 
+        action, and each playout is undone rather than run on a copy of its 
+        own.
+
+        The search time is limited further by the time bank, if there is one.  
+        With a playout budget, the search runs for that many playouts instead, 
+        regardless of time.
+        """
+        self._stop_pondering()
+        self._load_opening_tree(state)
+        start_time = time()
+
+        legal_actions = state.get_legal_actions()
+        if len(legal_actions) == 1:
+            # debug info
+            self.playout_total = 0
+            action = legal_actions[0]
+        else:
+            state = self._scratch_copy(state)
+            max_playouts = inf
+            move_time = inf
+            if self.playout_budget is not None:
+                max_playouts = self.playout_budget
+            else:
+                move_time = self.time_manager.move_time(state, allotted_time)
+
+            if self.sequential_halving is not None:
+                action = self._sequential_halving(state, move_time, max_playouts)
+            else:
+                # debug info
+                self.playout_total = self._run_playouts(state, move_time, 
+                                                        max_playouts)
+                action = self._max_trials_action(state)
+
+        # debug info
+        self.search_time = time() - start_time
+        self.time_manager.spend(self.search_time)
+        return action
+
+    def iter_search(self, state, interval):
+        """
+        Run playouts on the state until the caller stops iterating, yielding 
+        a SearchSnapshot of the action with the most trials after every 
+        interval seconds of search.
+
+        The search only runs while the caller is waiting for the next 
+        snapshot, so it is cancelled by no longer iterating.  Playouts run 
+        on the agent's scratch state, as in search.  Iteration ends on its 
+        own after one snapshot if there is only one legal action, or once 
+        the root is solved.
         """
+        self._stop_pondering()
+        self._load_opening_tree(state)
+
+        if state.num_legal_actions() == 1:
+            yield SearchSnapshot(state.get_legal_actions()[0], 0, None, 0)
+            return
+
+        state = self._scratch_copy(state)
         playouts = 0
+        searching = True
+        while searching:
+            playouts += self._run_playouts(state, interval, 
+                                            stop_when_settled = False)
+            searching = not self._root_solved()
+            # debug info
+            self.playout_total = playouts
+            yield self._snapshot(state, playouts)
+
+    def _scratch_copy(self, state):
+        """
+        Refill the scratch state with the state and return it.
+
+        The scratch state is allocated on first use, and again when the game 
+        changes, so searches do not copy the whole game every move.
+        """
+        if self.scratch_state is None or self.scratch_state.ACTION is not state.ACTION:
+            self.scratch_state = state.copy()
+        else:
+            state.copy_into(self.scratch_state)
+        return self.scratch_state
+
+    def _snapshot(self, state, playouts):
+        action = self._max_trials_action(state)
+        trials, _ = self.root_statistics().get(action.to_index(), (0, 0))
+        return SearchSnapshot(action, trials, self.action_win_rate(), playouts)
+
+    def _run_playouts(self, state, allotted_time, max_playouts = inf, 
+                        stop_when_settled = True):
+        """
+        Run playouts on the state until the allotted time is up, max_playouts 
+        playouts are run, the best action is settled, or the root is solved, 
+        returning the number of playouts run.  At least one run is made even 
+        if no time is allotted, such as when the time bank is empty, so that 
+        the root has a child to choose.
+
+        The clock is checked after every run, so a search overruns its time 
+        by at most one run however slow runs are.  Whether the best action 
+        is settled is only checked every TimeManager.CHECK_INTERVAL runs, 
+        and can be turned off, for searches that continue past the allotted 
+        time.
+        """
+        runs = 0
+        playouts = 0
+        history_length = len(state.action_history)
+        root_agent_id = state.current_agent_id
+        if self.playout_policy is not None:
+            self.playout_policy.prepare(state)
 
         start_time = time()
-        while time() - start_time < allotted_time:
-            current_state = state.copy()
-            selected_node = self._selection(current_state)
-            new_node = self._expansion(current_state, selected_node)
-            winning_id = self._simulation(current_state)
-            self._backpropagation(winning_id, new_node)
-            playouts += 1
+        elapsed_time = 0
+        while ((runs == 0 or elapsed_time < allotted_time) 
+                and playouts < max_playouts 
+                and not self._stop_requested and not self._root_solved()):
+            path = self._selection(state)
+            new_node = self._expansion(state, path[-1])
+            if new_node != path[-1]:
+                path.append(new_node)
+                self._add_to_tree_stats(path)
+            if self.leaf_playouts > 1:
+                results = self._leaf_simulations(state, path, history_length, 
+                                                    root_agent_id)
+                self._batch_backpropagation(results, path)
+            else:
+                winning_id = self._simulation(state)
+                self._backpropagation(winning_id, path)
+                if self.rave_equivalence is not None:
+                    self._update_rave(winning_id, path, 
+                                        state.action_history[history_length:])
+                if self.playout_policy is not None:
+                    self.playout_policy.update(winning_id, 
+                                        state.action_history[history_length:], 
+                                        root_agent_id, state.num_agents)
+            state.rewind(history_length)
+            runs += 1
+            playouts += self.leaf_playouts
+
+            elapsed_time = time() - start_time
+            if stop_when_settled and runs % TimeManager.CHECK_INTERVAL == 0:
+                remaining_playouts = min(max_playouts - playouts, 
+                                            TimeManager.remaining_playouts(
+                                    playouts, elapsed_time, allotted_time))
+                if self._best_action_settled(remaining_playouts):
+                    break
+        return playouts
+
+    def _sequential_halving(self, state, allotted_time, max_playouts):
+        """
+        Search the state by sequential halving for the allotted time or 
+        max_playouts playouts, returning the last remaining root action.
+
+        The candidate actions are expanded first, then each of the 
+        ceil(log2(candidates)) rounds gets an equal share of the search.  A 
+        round sweeps over its candidates, running one run below each in 
+        turn, so they all get the same number of runs however long the 
+        round lasts.  Every round sweeps at least once.  After each round 
+        the candidates are ranked by their proofs then their win rates, and 
+        the better half is kept.  If the root is solved, or no candidate 
+        fits in the node pool, the action with the most trials is returned 
+        instead.
+        """
+        candidates = self._expand_root(state, self.sequential_halving)
+        if not candidates:
+            return self._max_trials_action(state)
+        num_rounds = (len(candidates) - 1).bit_length()
+        round_time = allotted_time / max(1, num_rounds)
+        round_playouts = max_playouts / max(1, num_rounds)
+        sweep_playouts = len(candidates) * self.leaf_playouts
+        # debug info
+        self.playout_total = 0
+
+        for _ in range(num_rounds):
+            start_time = time()
+            playouts = 0
+            while (not self._root_solved() 
+                    and (playouts == 0 
+                        or (playouts + sweep_playouts <= round_playouts 
+                            and time() - start_time < round_time))):
+                for action in candidates:
+                    self.root_action = action
+                    playouts += self._run_playouts(state, inf, 1, 
+                                                    stop_when_settled = False)
+            self.root_action = None
+            # debug info
+            self.playout_total += playouts
+
+            if self._root_solved():
+                break
+            candidates.sort(key = self._halving_rank, reverse = True)
+            candidates = candidates[:ceil(len(candidates) / 2)]
+            sweep_playouts = len(candidates) * self.leaf_playouts
+
+        if self._root_solved():
+            return self._max_trials_action(state)
+        # debug info
+        self.action_node = self.root.get_child(candidates[0])
+        return candidates[0]
+
+    def _expand_root(self, state, num_candidates):
+        """
+        Choose num_candidates actions at the root and make sure each of them 
+        has a child, returning the actions that do.
+
+        Actions are sampled at random, or taken from the root's move 
+        ordering with progressive widening, so that children are still 
+        added in that order.  Actions are left out once the node pool is 
+        full.
+        """
+        legal_actions = state.get_legal_actions()
+        num_candidates = min(num_candidates, len(legal_actions))
+        if self.widening_exponent is not None:
+            if self.root.ordered_actions is None:
+                self.root.ordered_actions = state.ordered_legal_actions()
+            actions = self.root.ordered_actions[:num_candidates]
+        else:
+            actions = sample(legal_actions, num_candidates)
+
+        candidates = []
+        for action in actions:
+            if action not in self.root.children:
+                if self.node_pool is not None and self.node_pool.is_full():
+                    continue
+                new_child = self._expand_action(state, self.root, action)
+                state.undo_action()
+                self._add_to_tree_stats([self.root, new_child])
+            candidates.append(action)
+        return candidates
+
+    def _halving_rank(self, action):
+        """
+        Rank a root action by the proof of its child, then its win rate.
+        """
+        proof_rank = {True : 2, None : 1, False : 0}
+        child = self.root.get_child(action)
+        win_rate = child.value_estimate() if child.trials else 0
+        return (proof_rank[child.proven_win], win_rate)
+
+    def _best_action_settled(self, remaining_playouts):
+        """
+        Return a boolean indicating if the root action with the most trials 
+        can no longer be overtaken in the remaining playouts.
+        """
+        root_trials = [trials for trials, _ in self.root_statistics().values()]
+        return TimeManager.is_settled(root_trials, remaining_playouts)
+
+    def ponder(self, state):
+        """
+        Start running playouts on the state in a background thread, if 
+        pondering is enabled.
+
+        The state is reached by the agent's own action, so it is the state of 
+        the current root.  It may be a read-only StateView, the thread runs 
+        on the agent's scratch state, as in search.
+        """
+        if self.ponder_enabled:
+            self._stop_pondering()
+            self._load_opening_tree(state)
+            self._ponder_thread = Thread(target = self._ponder, 
+                                            args = (self._scratch_copy(state),), 
+                                            daemon = True)
+            self._ponder_thread.start()
+
+    def _ponder(self, state):
+        # debug info
+        self.ponder_total = self._run_playouts(state, inf)
+
+    def _stop_pondering(self):
+        """
+        Stop the pondering thread, if there is one, and wait for its current 
+        playout to finish.
+        """
+        if self._ponder_thread is not None:
+            self._stop_requested = True
+            self._ponder_thread.join()
+            self._ponder_thread = None
+            self._stop_requested = False
+
+    def take_action(self, action, is_my_action):
+        self._stop_pondering()
+        if self.playout_policy is not None:
+            self.playout_policy.clear()
+        super().take_action(action, is_my_action)
+
+    def reset(self):
+        self._stop_pondering()
+        self.time_manager.reset()
+        if self.playout_policy is not None:
+            self.playout_policy.clear()
+        super().reset()
+
+    def _root_solved(self):
+        return self.root.proven_win is not None
+
+    def _max_trials_action(self, state):
+        """
+        Return the action from the root with the most trials, preferring 
+        proven wins, see Node.max_trials.
 
+        A random action is returned if the root has no children, which 
+        happens when the node pool is full before the root is expanded.
+        """
+        if not self.root.has_children():
+            # debug info
+            self.action_node = None
+            return state.generate_random_action()
         max_action = self.root.max_trials()
         # debug info
-        self.playout_total = playouts
         self.action_node = self.root.get_child(max_action)
-
         return max_action
 
+    def root_statistics(self):
+        """
+        Return a dictionary from the action index of each explored root 
+        action to the (trials, wins) of its node.
+        """
+        return {action.to_index() : (child.trials, child.wins) 
+                    for action, child in self.root.children.items()}
+
     def _take_action(self, action):
         """
         Move the tree root to the child node of the current root corresponding
@@ -79,11 +546,66 @@ class MCTSAgent(Agent):
         If a node for that action has never been expanded, restart the tree
         from scratch.  This happens in cases where an adversary takes an
         action that we have not yet expanded and explored.
+
+        The new root is detached from its parent, so backpropagation stops at 
+        the root and the rest of the old tree can be collected.  With a node 
+        pool, the rest of the old tree is released to the pool instead.
+        """
+        new_root = self.root.children.get(action)
+        if self.node_pool is not None:
+            if new_root is not None:
+                del self.root.children[action]
+            self.node_pool.release(self.root)
+
+        if new_root is not None:
+            new_root.parent = None
+        else:
+            new_root = self._new_node(None, None)
+        self.root = new_root
+
+        self.root_ply += 1
+        if self.opening_root is not None and self.root_ply == self.TREE_FILE_PLIES:
+            self._save_opening_tree()
+
+    def _load_opening_tree(self, state):
+        """
+        Replace the tree with the one in the tree file, the first time the 
+        agent sees a state in each game.
+
+        The saved tree starts at the beginning of the game, the root moves 
+        down it along the actions already taken in the state.
+        """
+        if self.load_pending:
+            self.load_pending = False
+            initial_state = state.copy()
+            initial_state.rewind(0)
+            self.opening_root = load_tree(self.tree_file, initial_state, self.Node)
+
+            node = self.opening_root
+            for action in state.action_history:
+                node = node.children.get(action)
+                if node is None:
+                    node = self.Node(None, None)
+                    break
+            self.root = node
+            self.root_ply = len(state.action_history)
+
+    def _save_opening_tree(self):
         """
-        try:
-            self.root = self.root.get_child(action)
-        except KeyError:
-            self.root = self.Node(None, None)
+        Save the opening tree to the tree file, then let it be collected.
+        """
+        save_tree(self.tree_file, self.opening_root, self.TREE_FILE_PLIES)
+        self.opening_root = None
+
+    def _new_node(self, parent, agent_id):
+        """
+        Return a new Node, from the node pool if there is one.
+
+        Returns None if the node pool is full.
+        """
+        if self.node_pool is None:
+            return self.Node(parent, agent_id)
+        return self.node_pool.allocate(parent, agent_id)
 
     def _selection(self, state):
         """
@@ -91,42 +613,123 @@ class MCTSAgent(Agent):
         leaf is found or there are unexplored actions at the level we are
         exploring.
 
-        Uses the UCT algorithm to determine which nodes to progress to.
+        Uses the UCT algorithm to determine which nodes to progress to.  
+        During sequential halving, the first step is always to the child of 
+        root_action.
+
+        Returns the path of nodes from the root to the selected node.
         """
         node = self.root
-        unexplored_actions = len(state.get_legal_actions()) > len(node.children.keys())
+        path = [node]
+        node.num_actions = state.num_legal_actions()
+        if self.root_action is not None:
+            node = node.get_child(self.root_action)
+            path.append(node)
+            state.take_action(self.root_action)
+            node.num_actions = state.num_legal_actions()
+        unexplored_actions = self._num_considered_actions(node) > len(node.children)
 
         while not unexplored_actions and node.has_children():
-            action = node.UCT(state)
+            action = node.UCT(self.rave_equivalence)
             node = node.get_child(action)
+            path.append(node)
 
             state.take_action(action)
-            unexplored_actions = len(state.get_legal_actions()) > len(node.children.keys())
+            node.num_actions = state.num_legal_actions()
+            unexplored_actions = self._num_considered_actions(node) > len(node.children)
 
-        return node
+        return path
+
+    def _num_considered_actions(self, node):
+        """
+        Return the number of actions that can be explored from the node, 
+        every legal action unless progressive widening limits it.
+
+        Solved children do not count towards the progressive widening 
+        limit, since selection skips them.
+        """
+        num_actions = node.num_actions
+        if self.widening_exponent is not None:
+            num_solved = sum([child.proven_win is not None 
+                                for child in node.children.values()])
+            num_actions = min(num_actions, 
+                                num_solved + ceil((node.trials + 1) ** self.widening_exponent))
+        return num_actions
 
     def _expansion(self, state, node):
         """
         Handle the creation of a new leaf in the Node tree.
 
         Makes a random choice of the unexplored actions, adds that Node to
-        the tree, and progress the current game state by that action.
+        the tree, and progress the current game state by that action.  With 
+        progressive widening, the next action in the node's move ordering is 
+        chosen instead.
+
+        With a transposition table, the Node already stored for the resulting 
+        state is added instead of a new one, if there is one.
+
+        A new Node for a terminal state is proven to be a win or a loss, 
+        unless the game is a draw.
+
+        Nothing is expanded if the node pool is full.
         """
         new_child = node
-        if not state.is_terminal():
-            action = choice([action for action in state.get_legal_actions() if action not in node.children])
-            new_child = self.Node(node, state.current_agent_id)
-            node.add_child(action, new_child)
-            state.take_action(action)
+        pool_full = self.node_pool is not None and self.node_pool.is_full()
+        if not state.is_terminal() and not pool_full:
+            if self.widening_exponent is not None:
+                action = self._next_ordered_action(state, node)
+            else:
+                action = choice([action for action in state.get_legal_actions() if action not in node.children])
+            new_child = self._expand_action(state, node, action)
+
+        return new_child
+
+    def _expand_action(self, state, node, action):
+        """
+        Progress the state by the action and add a child of the node for it, 
+        as described in _expansion, returning the child.
 
+        The node pool must not be full.
+        """
+        agent_id = state.current_agent_id
+        state.take_action(action)
+
+        new_child = None
+        if self.transpositions is not None:
+            new_child = self.transpositions.get(state.zobrist_key)
+        if new_child is None:
+            new_child = self._new_node(node, agent_id)
+            if state.is_terminal():
+                new_child.prove_terminal(state.get_winning_id())
+            if self.transpositions is not None:
+                self.transpositions.put(state.zobrist_key, new_child)
+        node.add_child(action, new_child)
         return new_child
 
+    def _next_ordered_action(self, state, node):
+        """
+        Return the first action in the node's move ordering without a child.
+
+        The ordering is computed the first time the node is expanded.  
+        Children are always added in that order, so the next action is the 
+        one after the existing children.
+        """
+        if node.ordered_actions is None:
+            node.ordered_actions = state.ordered_legal_actions()
+        return node.ordered_actions[len(node.children)]
+
     def _simulation(self, state):
         """
         Play out the game to its conclusion and returns the winner.
+
+        Actions are chosen by the playout policy if there is one, and at 
+        random otherwise.
         """
         while not state.is_terminal():
-            action = self._random_simulation(state)
+            if self.playout_policy is not None:
+                action = self.playout_policy.choose_action(state)
+            else:
+                action = self._random_simulation(state)
             state.take_action(action)
         return state.get_winning_id()
 
@@ -141,16 +744,117 @@ class MCTSAgent(Agent):
         action = state.generate_random_action()
         return action
 
-    def _backpropagation(self, winning_id, node):
+    def _backpropagation(self, winning_id, path):
         """
-        Update nodes from node to the tree root with the simulation result.
+        Update the nodes on the path from the tree root with the simulation 
+        result, then propagate proofs up the path.
         """
-        while node is not None:
+        for node in path:
             node.update_node(winning_id)
-            node = node.parent
+        self._propagate_proofs(path)
+
+    def _leaf_simulations(self, state, path, history_length, root_agent_id):
+        """
+        Play out the game leaf_playouts times from the state at the end of 
+        the path, returning a Counter of the winning ids.
+
+        RAVE statistics and the playout policy are updated after each 
+        playout, from the actions taken since history_length, the first of 
+        them by root_agent_id.
+        """
+        leaf_length = len(state.action_history)
+        results = Counter()
+        for _ in range(self.leaf_playouts):
+            winning_id = self._simulation(state)
+            if self.rave_equivalence is not None:
+                self._update_rave(winning_id, path, 
+                                    state.action_history[history_length:])
+            if self.playout_policy is not None:
+                self.playout_policy.update(winning_id, 
+                                    state.action_history[history_length:], 
+                                    root_agent_id, state.num_agents)
+            state.rewind(leaf_length)
+            results[winning_id] += 1
+        return results
+
+    def _batch_backpropagation(self, results, path):
+        """
+        Update the nodes on the path from the tree root with a Counter of 
+        simulation results, in one pass.
+        """
+        for node in path:
+            node.update_node_results(results)
+        self._propagate_proofs(path)
+
+    def _propagate_proofs(self, path):
+        """
+        If the last node on the path is solved, try to prove its ancestors in 
+        turn, stopping at the first one that cannot be proven.
+        """
+        if path[-1].proven_win is not None:
+            for node in reversed(path[:-1]):
+                if not node.update_proof():
+                    break
+
+    def _update_rave(self, winning_id, path, actions):
+        """
+        Update the RAVE statistics of the children of each node on the path 
+        with the simulation result.
+
+        actions are all of the actions taken in the run, starting from the 
+        root.  A child is updated when its action was taken at its parent or 
+        any time after.  Actions identify the agent taking them, so only 
+        actions by the same agent match.
+        """
+        played = set()
+        for i in range(len(actions) - 1, -1, -1):
+            played.add(actions[i])
+            if i < len(path):
+                for action, child in path[i].children.items():
+                    if action in played:
+                        child.update_rave(winning_id)
+
+    def _add_to_tree_stats(self, path):
+        """
+        Count the new node at the end of the path in the subtree size and 
+        height of each node above it.
+        """
+        height = 0
+        for node in reversed(path[:-1]):
+            height += 1
+            node.subtree_size += 1
+            if node.height < height:
+                node.height = height
+
+    def tree_stats(self):
+        """
+        Return a dictionary of statistics about the tree below the root:  its 
+        max depth, its number of nodes, and an estimate of their memory use 
+        in bytes.
+
+        The statistics are kept up to date during expansion rather than 
+        computed by walking the tree.  With a transposition table, nodes 
+        reached by several move orders are counted once per move order.
+        """
+        node = self.Node(None, None)
+        bytes_per_node = getsizeof(node) + getsizeof(node.__dict__) + getsizeof(node.children)
+        return {"max_depth" : self.root.height, 
+                "num_nodes" : self.root.subtree_size, 
+                "memory_bytes" : self.root.subtree_size * bytes_per_node}
+
+    def action_win_rate(self):
+        """
+        Return the simulation win rate of the latest action chosen, or 0 if 
+        there is none.
+        """
+        win_rate = 0
+        if self.action_node is not None:
+            win_rate = self.action_node.value_estimate()
+        return win_rate
 
     def __str__(self):
-        return "playouts {} | node {} | tree max depth {}".format(self.playout_total, self.action_node, self.root.depth())
+        playout_rate = self.playout_total / self.search_time if self.search_time else 0
+        return "playouts {} ({:.0f}/s) | node {} | tree max depth {}".format(self.playout_total, playout_rate, self.action_node, self.tree_stats()["max_depth"])
 
 
     class Node:
@@ -161,16 +865,37 @@ class MCTSAgent(Agent):
         - its place in the tree,
         - the agent id of the agent who is choosing the next action,
         - and the win% of that agent from this point in the game tree.
+
+        proven_win is True or False once the node is proven to be a win or a 
+        loss for that agent, and None while its outcome is unknown.  
+        num_actions is the number of legal actions from the node, recorded 
+        when selection reaches it.  subtree_size and height count the nodes 
+        below it and the length of the longest path down from it, see 
+        MCTSAgent.tree_stats.
         """
 
         EXPLORATION_PARAM = sqrt(2)
 
         def __init__(self, parent, agent_id):
+            self.reset(parent, agent_id)
+
+        def reset(self, parent, agent_id):
+            """
+            Clear the node's statistics and children, so that a NodePool can 
+            reuse it.
+            """
             self.parent = parent
             self.children = dict() # action : node
             self.trials = 0
             self.wins = 0
+            self.rave_trials = 0
+            self.rave_wins = 0
             self.agent_id = agent_id
+            self.ordered_actions = None
+            self.proven_win = None
+            self.num_actions = None
+            self.subtree_size = 1
+            self.height = 0
 
         def update_node(self, winning_id):
             """
@@ -180,19 +905,66 @@ class MCTSAgent(Agent):
                 self.wins += 1
             self.trials += 1
 
+        def update_node_results(self, results):
+            """
+            Update node using a Counter of simulation results, as 
+            update_node does for each one.
+            """
+            if self.agent_id is not None:
+                self.wins += results[self.agent_id]
+            self.trials += sum(results.values())
+
+        def update_rave(self, winning_id):
+            """
+            Update node's RAVE statistics using a simulation result in which 
+            its action was played.
+            """
+            if self.agent_id is not None and winning_id == self.agent_id:
+                self.rave_wins += 1
+            self.rave_trials += 1
+
+        def prove_terminal(self, winning_id):
+            """
+            Prove the node from the winner of its terminal state.
+            """
+            if winning_id is not None:
+                self.proven_win = winning_id == self.agent_id
+
+        def update_proof(self):
+            """
+            Try to prove the node from the proofs of its children, returning 
+            a boolean indicating if the node is solved.
+
+            The children are chosen by the next agent, so one winning child 
+            makes the node a loss, and losing children for all of its actions 
+            make it a win.
+            """
+            children = self.children.values()
+            if any([child.proven_win for child in children]):
+                self.proven_win = False
+            elif (len(self.children) == self.num_actions
+                    and all([child.proven_win is False for child in children])):
+                self.proven_win = True
+            return self.proven_win is not None
+
         def value_estimate(self):
             return self.wins / self.trials
 
         def max_trials(self):
             """
             Return the child node with the maximum number of trials.
+
+            A proven winning child is always chosen, and proven losing 
+            children only when every child is one.
             """
-            value_func = lambda x: self.get_child(x).trials
+            proof_rank = {True : 2, None : 1, False : 0}
+            value_func = lambda x: (proof_rank[self.get_child(x).proven_win], 
+                                    self.get_child(x).trials)
             return max(self.children, key=value_func)
 
-        def UCT(self, state):
+        def UCT(self, rave_equivalence = None):
             """
-            Choose an action based on an exploitation vs exploration function
+            Choose an action among the children based on an exploitation vs exploration function
             that expresses node value as:
 
             (exploitation)
@@ -200,13 +972,27 @@ class MCTSAgent(Agent):
             +
             (exploration)
             exploration parameter * sqrt(ln(num trials at node) / num trials at child)
-            """
-            valid_actions = state.get_legal_actions()
 
+            With a rave_equivalence of k, the exploitation term is blended with 
+            the RAVE win rate of the child as:
+
+            (1 - beta) * win rate + beta * RAVE win rate
+            beta = sqrt(k / (3 * num trials at child + k))
+
+            Solved children are skipped, scoring infinitely high if they are 
+            proven wins and infinitely low if they are proven losses.
+            """
             results = {}
-            for action in valid_actions:
-                child_node = self.get_child(action)
+            for action, child_node in self.children.items():
+                if child_node.proven_win is not None:
+                    results[action] = inf if child_node.proven_win else -inf
+                    continue
                 value_estimate = child_node.value_estimate()
+                if rave_equivalence is not None and child_node.rave_trials > 0:
+                    beta = sqrt(rave_equivalence 
+                                / (3 * child_node.trials + rave_equivalence))
+                    rave_estimate = child_node.rave_wins / child_node.rave_trials
+                    value_estimate = (1 - beta) * value_estimate + beta * rave_estimate
                 exploration_estimate = self.EXPLORATION_PARAM * sqrt(log(self.trials) / child_node.trials)
                 results[action] = value_estimate + exploration_estimate
             return max(results.keys(), key=results.get)
@@ -220,11 +1006,5 @@ class MCTSAgent(Agent):
         def has_children(self):
             return bool(self.children)
 
-        def depth(self):
-            depth = 0
-            if self.has_children():
-                depth = 1 + max([child.depth() for child in self.children.values()])
-            return depth
-
         def __str__(self):
             return "ID{},{}/{}".format(self.agent_id, self.wins, self.trials)
@@ -0,0 +1,60 @@
+class NodePool:
+    """
+    A bounded allocator of search nodes.
+
+    Used by MCTSAgent to cap the size of its tree.  At most max_nodes nodes
+    are allocated at once, after that allocate returns None until nodes are
+    released.  Released nodes are kept on a free list and reused by later
+    allocations instead of being left to the garbage collector.
+
+    Nodes must be released at most once, so a pool cannot be shared by the
+    nodes of a directed acyclic graph.
+    """
+
+    def __init__(self, max_nodes, node_class):
+        if max_nodes < 1:
+            raise RuntimeError("Node pool size must be positive.")
+
+        self.max_nodes = max_nodes
+        self.node_class = node_class
+        self.free_nodes = []
+        self.num_allocated = 0
+
+    def allocate(self, parent, agent_id):
+        """
+        Return a new node with the given parent and agent id, or None if the
+        pool is full.
+        """
+        node = None
+        if not self.is_full():
+            if self.free_nodes:
+                node = self.free_nodes.pop()
+                node.reset(parent, agent_id)
+            else:
+                node = self.node_class(parent, agent_id)
+            self.num_allocated += 1
+        return node
+
+    def release(self, node):
+        """
+        Return the node and all of its descendants to the pool.
+        """
+        nodes = [node]
+        while nodes:
+            node = nodes.pop()
+            nodes.extend(node.children.values())
+            node.reset(None, None)
+            self.free_nodes.append(node)
+            self.num_allocated -= 1
+
+    def clear(self):
+        """
+        Forget every allocated node, without reusing them.
+        """
+        self.num_allocated = 0
+
+    def is_full(self):
+        return self.num_allocated >= self.max_nodes
+
+    def __len__(self):
+        return self.num_allocated
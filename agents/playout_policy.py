@@ -0,0 +1,159 @@
+"""
+Adaptive playout policies for MCTSAgent.
+
+A policy replaces the light playout of MCTSAgent, choosing the actions of
+each simulation from what earlier runs of the search have learned.  After
+every run the policy is updated with all of its actions, from the root to
+the end of the simulation, and the winner.
+
+Policies store their statistics in flat tables, a list indexed by agent id
+of lists indexed by action index, see Action.to_index.  The tables are
+cleared whenever the root of the search moves.
+"""
+
+
+from abc import ABC, abstractmethod
+
+
+class PlayoutPolicy(ABC):
+    """
+    Abstract base class for playout policies.
+    """
+
+    def __init__(self):
+        self.tables = None
+
+    def clear(self):
+        """
+        Forget everything learned, the tables are built again by the next
+        call to prepare.
+        """
+        self.tables = None
+
+    def prepare(self, state):
+        """
+        Build the tables for the state's game, if they are not built yet.
+        """
+        if self.tables is None:
+            self.tables = [self._new_table(state.ACTION_SPACE_SIZE)
+                            for _ in range(state.NUM_PLAYERS)]
+
+    def update(self, winning_id, actions, first_agent_id, num_agents):
+        """
+        Learn from the actions of a run and its winner.
+
+        The first action was taken by first_agent_id, agents alternate
+        turns after that.
+        """
+        for i, action in enumerate(actions):
+            agent_id = (first_agent_id + i) % num_agents
+            self._update_action(winning_id, agent_id, actions, i)
+
+    @abstractmethod
+    def _new_table(self, action_space_size):
+        """
+        Return the table of one agent.
+        """
+        pass
+
+    @abstractmethod
+    def choose_action(self, state):
+        """
+        Return the action to take in the state during a simulation.
+        """
+        pass
+
+    @abstractmethod
+    def _update_action(self, winning_id, agent_id, actions, i):
+        """
+        Learn from the i-th action of the run, taken by agent_id.
+        """
+        pass
+
+
+class MASTPolicy(PlayoutPolicy):
+    """
+    Move-Average Sampling Technique.
+
+    Keeps the number of runs each agent played each action in, and how many
+    of those the agent won.  Each simulation step samples tournament_size
+    random legal actions and takes the one with the highest average, so
+    the cost of a step stays independent of the number of legal actions.
+    Actions that have not been played yet count as having won half of one
+    run.
+    """
+
+    def __init__(self, tournament_size = 2):
+        super().__init__()
+        if tournament_size < 1:
+            raise RuntimeError("Tournament size must be positive.")
+        self.tournament_size = tournament_size
+
+    def _new_table(self, action_space_size):
+        return [[0, 0] for _ in range(action_space_size)]  # [wins, trials]
+
+    def choose_action(self, state):
+        table = self.tables[state.current_agent_id]
+        best_action = state.generate_random_action()
+        wins, trials = table[best_action.to_index()]
+        best_value = (wins + 0.5) / (trials + 1)
+        for _ in range(self.tournament_size - 1):
+            action = state.generate_random_action()
+            wins, trials = table[action.to_index()]
+            value = (wins + 0.5) / (trials + 1)
+            if value > best_value:
+                best_action = action
+                best_value = value
+        return best_action
+
+    def _update_action(self, winning_id, agent_id, actions, i):
+        entry = self.tables[agent_id][actions[i].to_index()]
+        if winning_id == agent_id:
+            entry[0] += 1
+        entry[1] += 1
+
+    def __str__(self):
+        return "MAST"
+
+
+class LastGoodReplyPolicy(PlayoutPolicy):
+    """
+    Last-Good-Reply with forgetting.
+
+    Keeps, for each agent and each action of the previous agent, the index
+    of the agent's reply in the latest run it won.  A reply is forgotten
+    when the agent plays it and loses.  Each simulation step takes the
+    stored reply to the previous action if there is one and it is legal,
+    and a random action otherwise.
+    """
+
+    NO_REPLY = -1
+
+    def _new_table(self, action_space_size):
+        return [self.NO_REPLY] * action_space_size
+
+    def choose_action(self, state):
+        action = None
+        if state.action_history:
+            previous_index = state.action_history[-1].to_index()
+            reply = self.tables[state.current_agent_id][previous_index]
+            if reply != self.NO_REPLY:
+                action = state.action_from_index(reply)
+                if not state.is_legal_action(action):
+                    action = None
+        if action is None:
+            action = state.generate_random_action()
+        return action
+
+    def _update_action(self, winning_id, agent_id, actions, i):
+        if i > 0 and winning_id is not None:
+            table = self.tables[agent_id]
+            previous_index = actions[i - 1].to_index()
+            reply = actions[i].to_index()
+            if winning_id == agent_id:
+                table[previous_index] = reply
+            elif table[previous_index] == reply:
+                table[previous_index] = self.NO_REPLY
+
+    def __str__(self):
+        return "LGRF"
@@ -0,0 +1,104 @@
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from os import cpu_count
+from random import seed
+
+from agents.mcts_agent import MCTSAgent
+
+from willsmith.agent import Agent
+
+
+class RootParallelMCTSAgent(Agent):
+    """
+    Planning agent that runs root-parallel Monte Carlo Tree Search across a 
+    pool of worker processes.
+
+    Each worker process runs an independent search, with its own tree, on a 
+    copy of the state for the allotted time.  The trials and wins of the 
+    root actions of every worker are then summed, and the action with the 
+    most trials overall is returned.
+
+    The workers are started on the first search and reused for every search 
+    after that.  Trees are not kept between searches, since a move may be 
+    searched by any of the workers.
+    """
+
+    def __init__(self, agent_id, use_gui, num_workers = None, 
+                    worker_class = MCTSAgent):
+        """
+        num_workers defaults to the number of CPUs, and worker_class is the 
+        agent class each worker searches with.  It must implement 
+        root_statistics.
+        """
+        super().__init__(agent_id, use_gui)
+        self.num_workers = num_workers if num_workers else cpu_count()
+        self.worker_class = worker_class
+        self.pool = None
+        self._reset()
+
+    def _reset(self):
+        self.playout_total = 0
+        self.action_statistics = None
+
+    def search(self, state, allotted_time):
+        """
+        Run a search in every worker and return the action with the most 
+        trials across all of them.
+
+        With only one legal action, it is returned without searching, as 
+        the workers would not search either.
+        """
+        legal_actions = state.get_legal_actions()
+        if len(legal_actions) == 1:
+            # debug info
+            self.playout_total = 0
+            self.action_statistics = None
+            return legal_actions[0]
+
+        if self.pool is None:
+            # reseed each worker so they do not share forked random state
+            self.pool = ProcessPoolExecutor(self.num_workers, initializer = seed)
+
+        futures = [self.pool.submit(_worker_search, self.worker_class, state, 
+                                        allotted_time)
+                    for _ in range(self.num_workers)]
+
+        playouts = 0
+        root_statistics = defaultdict(lambda: [0, 0])
+        for future in futures:
+            worker_playouts, worker_statistics = future.result()
+            playouts += worker_playouts
+            for action_index, (trials, wins) in worker_statistics.items():
+                root_statistics[action_index][0] += trials
+                root_statistics[action_index][1] += wins
+
+        max_index = max(root_statistics, key = lambda x: root_statistics[x][0])
+        # debug info
+        self.playout_total = playouts
+        self.action_statistics = root_statistics[max_index]
+
+        return state.action_from_index(max_index)
+
+    def shutdown(self):
+        """
+        Stop the worker processes, they are restarted by the next search.
+        """
+        if self.pool is not None:
+            self.pool.shutdown()
+            self.pool = None
+
+    def _take_action(self, action):
+        pass
+
+    def __str__(self):
+        return "workers {} | playouts {} | node trials/wins {}".format(self.num_workers, self.playout_total, self.action_statistics)
+
+
+def _worker_search(agent_class, state, allotted_time):
+    """
+    Run a search with a new agent in a worker process, returning the playout 
+    count and root statistics.
+    """
+    agent = agent_class(state.current_agent_id, False)
+    agent.search(state, allotted_time)
+    return agent.playout_total, agent.root_statistics()
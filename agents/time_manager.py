@@ -0,0 +1,70 @@
+from math import ceil, inf
+
+
+class TimeManager:
+    """
+    Decides how long MCTSAgent searches for each move.
+
+    Without a time bank every search may use its full allotted time.  With a
+    time bank, a number of seconds for the whole game, each search is also
+    limited to an even share of the remaining bank over the agent's expected
+    remaining moves, and time left unused by a search stays in the bank for
+    later moves.
+
+    During a search the clock is checked after every run, and every
+    CHECK_INTERVAL runs the search can stop early once the most visited
+    root action is settled, when the runner-up could not catch up to it
+    even if every remaining playout went to the runner-up.
+    """
+
+    CHECK_INTERVAL = 16
+
+    def __init__(self, time_bank = None):
+        if time_bank is not None and time_bank <= 0:
+            raise RuntimeError("Time bank must be positive.")
+
+        self.time_bank = time_bank
+        self.remaining_bank = time_bank
+
+    def reset(self):
+        self.remaining_bank = self.time_bank
+
+    def move_time(self, state, allotted_time):
+        """
+        Return the time to search the state for, at most allotted_time.
+
+        The expected number of remaining moves for the agent is its share of
+        the remaining legal actions.
+        """
+        move_time = allotted_time
+        if self.remaining_bank is not None:
+            expected_moves = max(1, ceil(state.num_legal_actions() / state.NUM_PLAYERS))
+            move_time = min(move_time, self.remaining_bank / expected_moves)
+        return move_time
+
+    def spend(self, seconds):
+        """
+        Take the time used by a search out of the bank.
+        """
+        if self.remaining_bank is not None:
+            self.remaining_bank = max(0, self.remaining_bank - seconds)
+
+    @staticmethod
+    def remaining_playouts(playouts, elapsed_time, allotted_time):
+        """
+        Estimate the number of playouts left in the search from the rate so
+        far.
+        """
+        remaining = inf
+        if elapsed_time > 0:
+            remaining = playouts * (allotted_time - elapsed_time) / elapsed_time
+        return remaining
+
+    @staticmethod
+    def is_settled(root_trials, remaining_playouts):
+        """
+        Return a boolean indicating if the most visited root action can no
+        longer be overtaken, given the trials of each explored root action.
+        """
+        best, runner_up = (sorted(root_trials, reverse = True) + [0, 0])[:2]
+        return best - runner_up > remaining_playouts
@@ -0,0 +1,47 @@
+from collections import OrderedDict
+
+
+class TranspositionTable:
+    """
+    A bounded mapping from game state keys to search nodes.
+
+    Used by MCTSAgent to share one node between every move order that 
+    reaches the same state, turning the search tree into a directed acyclic 
+    graph.  States are identified by their Zobrist key.
+
+    Once the table is full, the least recently used entry is evicted.  An 
+    evicted node stays in the graph, but is no longer found by new move 
+    orders reaching its state.
+    """
+
+    def __init__(self, max_size):
+        if max_size < 1:
+            raise RuntimeError("Transposition table size must be positive.")
+
+        self.max_size = max_size
+        self.entries = OrderedDict()    # state key : node
+
+    def get(self, key):
+        """
+        Return the node stored for the key, or None if there is none.
+        """
+        node = self.entries.get(key)
+        if node is not None:
+            self.entries.move_to_end(key)
+        return node
+
+    def put(self, key, node):
+        """
+        Store the node for the key, evicting the least recently used entry 
+        if the table is full.
+        """
+        self.entries[key] = node
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.max_size:
+            self.entries.popitem(last = False)
+
+    def clear(self):
+        self.entries.clear()
+
+    def __len__(self):
+        return len(self.entries)
@@ -0,0 +1,90 @@
+"""
+Functions for saving the top plies of an MCTSAgent tree to a binary file and
+loading them back.
+
+Trees are stored as a NumPy array of fixed size records, one per node in
+preorder, so each node is followed by the subtrees of its children:
+
+    action_index    -   Action.to_index of the action leading to the node,
+                            -1 for the root
+    agent_id        -   agent id of the node, -1 for None
+    num_children    -   number of children stored after the node
+    trials          -   number of playouts through the node
+    wins            -   number of those playouts won by agent_id
+
+Actions are stored as indices, so loading a tree needs the state of its root
+to turn them back into actions.
+"""
+
+
+import numpy as np
+
+
+TREE_DTYPE = np.dtype([("action_index", np.int32), ("agent_id", np.int8),
+                        ("num_children", np.int32), ("trials", np.int32),
+                        ("wins", np.int32)])
+
+
+def save_tree(path, root, max_depth):
+    """
+    Save the nodes of the tree within max_depth plies of the root.
+    """
+    records = []
+    nodes = [(None, root, 0)]
+    while nodes:
+        action, node, depth = nodes.pop()
+        children = []
+        if depth < max_depth:
+            children = list(node.children.items())
+
+        action_index = -1 if action is None else action.to_index()
+        agent_id = -1 if node.agent_id is None else node.agent_id
+        records.append((action_index, agent_id, len(children), node.trials,
+                        node.wins))
+        nodes.extend([(child_action, child, depth + 1)
+                        for child_action, child in reversed(children)])
+
+    with open(path, "wb") as tree_file:
+        np.save(tree_file, np.array(records, dtype = TREE_DTYPE))
+
+def load_tree(path, state, node_class):
+    """
+    Load a saved tree whose root is the given state, returning its root node.
+
+    The state is used to turn action indices back into actions, and is
+    restored before returning.
+    """
+    with open(path, "rb") as tree_file:
+        records = np.load(tree_file)
+
+    history_length = len(state.action_history)
+    root = _node_from_record(records[0], None, node_class)
+    nodes = [root]
+    path = [(root, records[0]["num_children"])]
+    for record in records[1:]:
+        while path[-1][1] == 0:
+            path.pop()
+            state.undo_action()
+        parent, num_children = path[-1]
+        path[-1] = (parent, num_children - 1)
+
+        action = state.action_from_index(int(record["action_index"]))
+        node = _node_from_record(record, parent, node_class)
+        parent.add_child(action, node)
+        nodes.append(node)
+
+        state.take_action(action)
+        path.append((node, record["num_children"]))
+    state.rewind(history_length)
+
+    for node in reversed(nodes[1:]):
+        node.parent.subtree_size += node.subtree_size
+        node.parent.height = max(node.parent.height, node.height + 1)
+    return root
+
+def _node_from_record(record, parent, node_class):
+    agent_id = None if record["agent_id"] == -1 else int(record["agent_id"])
+    node = node_class(parent, agent_id)
+    node.trials = int(record["trials"])
+    node.wins = int(record["wins"])
+    return node
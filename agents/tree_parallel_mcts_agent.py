@@ -0,0 +1,160 @@
+from os import cpu_count
+from random import choice
+from threading import Lock, Thread
+from time import time
+
+from agents.mcts_agent import MCTSAgent
+
+
+class TreeParallelMCTSAgent(MCTSAgent):
+    """
+    MCTSAgent variant that runs tree-parallel search, with several threads
+    sharing one tree.
+
+    Each thread runs playouts on its own scratch copy of the state, which is
+    kept between searches and refilled with Game.copy_into.  While a thread
+    descends through the tree it applies a virtual loss to every node on its
+    path, counting a trial that has not been won yet, so that other threads
+    are steered towards different paths.  Backpropagation replaces the
+    virtual loss with the real result.
+
+    Node updates and child creation are guarded by a fixed pool of locks,
+    with each node mapped to one of them, so threads only contend when they
+    update nodes sharing a lock.
+
+    Threads only run in parallel on free-threaded builds of Python, on
+    builds with the GIL they interleave.  See benchmarks/bench_tree_parallel.py.
+    """
+
+    NUM_LOCKS = 64
+    VIRTUAL_LOSS = 1
+
+    def __init__(self, agent_id, use_gui, num_threads = None):
+        """
+        num_threads defaults to the number of CPUs.
+        """
+        self.num_threads = num_threads if num_threads else cpu_count()
+        self.locks = [Lock() for _ in range(self.NUM_LOCKS)]
+        self.thread_states = None
+        super().__init__(agent_id, use_gui)
+
+    def search(self, state, allotted_time):
+        """
+        Run playouts in every thread for the allotted time, then return the
+        action from the root with the most trials.
+
+        As in MCTSAgent, a single legal action is returned without 
+        searching, and the search time is limited by the time bank.
+        """
+        self._stop_pondering()
+        legal_actions = state.get_legal_actions()
+        if len(legal_actions) == 1:
+            # debug info
+            self.playout_total = 0
+            self.search_time = 0
+            return legal_actions[0]
+
+        start_time = time()
+        allotted_time = self.time_manager.move_time(state, allotted_time)
+        playouts = [0] * self.num_threads
+
+        def run_thread(thread_id, thread_state):
+            playouts[thread_id] = self._run_playouts(thread_state, allotted_time)
+
+        if self.thread_states is None or self.thread_states[0].ACTION is not state.ACTION:
+            self.thread_states = [state.copy() for _ in range(self.num_threads)]
+        else:
+            for thread_state in self.thread_states:
+                state.copy_into(thread_state)
+
+        threads = [Thread(target = run_thread, args = (i, thread_state))
+                    for i, thread_state in enumerate(self.thread_states)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        action = self._max_trials_action(state)
+
+        # debug info
+        self.playout_total = sum(playouts)
+        self.search_time = time() - start_time
+        self.time_manager.spend(self.search_time)
+        return action
+
+    def _selection(self, state):
+        """
+        Progress through the tree as in MCTSAgent, applying a virtual loss to
+        each node visited.
+        """
+        node = self.root
+        path = [node]
+        self._add_virtual_loss(node)
+        unexplored_actions = state.num_legal_actions() > len(node.children)
+
+        while not unexplored_actions and node.has_children():
+            action = node.UCT()
+            node = node.get_child(action)
+            path.append(node)
+            self._add_virtual_loss(node)
+
+            state.take_action(action)
+            unexplored_actions = state.num_legal_actions() > len(node.children)
+
+        return path
+
+    def _expansion(self, state, node):
+        """
+        Create a new child of the node for a random unexplored action, as in
+        MCTSAgent.
+
+        New children start with a virtual loss applied, so they always have
+        trials when other threads compute UCT values.  If other threads have
+        explored every action in the meantime, descend to an existing child
+        instead.
+        """
+        new_child = node
+        if not state.is_terminal():
+            with self._get_lock(node):
+                unexplored = [action for action in state.get_legal_actions()
+                                if action not in node.children]
+                if unexplored:
+                    action = choice(unexplored)
+                    new_child = self.Node(node, state.current_agent_id)
+                    new_child.trials = self.VIRTUAL_LOSS
+                    node.add_child(action, new_child)
+
+            if not unexplored:
+                action = node.UCT()
+                new_child = node.get_child(action)
+                self._add_virtual_loss(new_child)
+            state.take_action(action)
+
+        return new_child
+
+    def _backpropagation(self, winning_id, path):
+        """
+        Update the nodes on the path with the simulation result, removing the
+        virtual loss applied during selection.
+        """
+        for node in path:
+            with self._get_lock(node):
+                node.trials -= self.VIRTUAL_LOSS
+                node.update_node(winning_id)
+
+    def _best_action_settled(self, remaining_playouts):
+        """
+        Never stop early, other threads may be adding root children while the 
+        root statistics are read.
+        """
+        return False
+
+    def _add_virtual_loss(self, node):
+        with self._get_lock(node):
+            node.trials += self.VIRTUAL_LOSS
+
+    def _get_lock(self, node):
+        return self.locks[hash(node) % self.NUM_LOCKS]
+
+    def __str__(self):
+        return "threads {} | {}".format(self.num_threads, super().__str__())
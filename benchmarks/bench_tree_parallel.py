@@ -0,0 +1,47 @@
+"""
+Benchmark of tree-parallel MCTS throughput by thread count.
+
+Reports the playouts per second of TreeParallelMCTSAgent from the opening 
+position with 1, 2, 4 and 8 threads, against the single-threaded 
+MCTSAgent.  Run it on both a GIL build and a free-threaded build of Python 
+to decide when tree-parallel search is worth enabling; on GIL builds the 
+threads interleave rather than run in parallel.
+
+Run from the repository root with python -m benchmarks.bench_tree_parallel
+"""
+
+
+import sys
+
+from agents.mcts_agent import MCTSAgent
+from agents.tree_parallel_mcts_agent import TreeParallelMCTSAgent
+
+from games.havannah.havannah import Havannah
+from games.ttt.nested_ttt import NestedTTT
+
+
+ALLOTTED_TIME = 2.0
+THREAD_COUNTS = [1, 2, 4, 8]
+
+
+def playouts_per_second(agent, game_class):
+    agent.search(game_class(None), ALLOTTED_TIME)
+    return agent.playout_total / ALLOTTED_TIME
+
+def main():
+    gil_enabled = getattr(sys, "_is_gil_enabled", lambda: True)()
+    print("Python {} ({})".format(sys.version.split()[0], 
+                                    "GIL" if gil_enabled else "free-threaded"))
+
+    for game_class in [NestedTTT, Havannah]:
+        baseline = playouts_per_second(MCTSAgent(0, False), game_class)
+        print("{}".format(game_class.__name__))
+        print("    {:<12} {:>8.1f} playouts/s".format("MCTSAgent", baseline))
+        for num_threads in THREAD_COUNTS:
+            agent = TreeParallelMCTSAgent(0, False, num_threads)
+            rate = playouts_per_second(agent, game_class)
+            print("    {:<12} {:>8.1f} playouts/s {:>6.2f}x".format(
+                    "{} threads".format(num_threads), rate, rate / baseline))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Benchmark of UCT child selection at a fully expanded root.
+
+Compares the per-child loop of MCTSAgent.Node.UCT, a per-child loop over
+the ArrayTree arrays, and the vectorized ArrayTree.uct_child, for the root
+branching factors of NestedTTT and Havannah.
+
+Run from the repository root with python -m benchmarks.bench_uct
+"""
+
+
+from math import log, sqrt
+from random import Random
+from timeit import repeat
+
+from agents.array_tree import ArrayTree
+from agents.mcts_agent import MCTSAgent
+
+from games.havannah.havannah import Havannah
+from games.ttt.nested_ttt import NestedTTT
+
+
+NUM_CALLS = 1000
+NUM_REPEATS = 5
+
+
+def build_trees(state, rng):
+    """
+    Build an object tree and an array tree with the same randomly visited
+    root children, one for each legal action of the state.
+    """
+    actions = state.get_legal_actions()
+
+    root = MCTSAgent.Node(None, None)
+    array_tree = ArrayTree()
+    array_tree.add_children(array_tree.root,
+                            [action.to_index() for action in actions], 0)
+
+    for action in actions:
+        node = MCTSAgent.Node(root, 0)
+        root.add_child(action, node)
+        child = array_tree.expand_next_child(array_tree.root)
+
+        trials = rng.randint(1, 100)
+        wins = rng.randint(0, trials)
+        node.trials = array_tree.trials[child] = trials
+        node.wins = array_tree.wins[child] = wins
+        root.trials += trials
+        array_tree.trials[array_tree.root] += trials
+    return root, array_tree
+
+def array_loop_uct_child(tree, node):
+    """
+    Per-child loop over the arrays, the selection ArrayTree.uct_child
+    replaced.
+    """
+    first_child = tree.first_child[node]
+    log_trials = log(tree.trials[node])
+
+    max_child = -1
+    max_value = None
+    for child in range(first_child, first_child + tree.num_children[node]):
+        child_trials = tree.trials[child]
+        value = (tree.wins[child] / child_trials
+                    + tree.EXPLORATION_PARAM * sqrt(log_trials / child_trials))
+        if max_value is None or value > max_value:
+            max_child = child
+            max_value = value
+    return max_child
+
+def best_time(func):
+    return min(repeat(func, number = NUM_CALLS, repeat = NUM_REPEATS)) / NUM_CALLS
+
+def main():
+    rng = Random(0)
+    for game_class in [NestedTTT, Havannah]:
+        state = game_class(None)
+        root, array_tree = build_trees(state, rng)
+
+        results = [("Node.UCT loop", best_time(lambda: root.UCT())),
+                    ("array loop", best_time(lambda: array_loop_uct_child(array_tree, array_tree.root))),
+                    ("ArrayTree.uct_child", best_time(lambda: array_tree.uct_child(array_tree.root)))]
+
+        print("{} ({} children)".format(game_class.__name__,
+                                        state.num_legal_actions()))
+        baseline = results[0][1]
+        for label, seconds in results:
+            print("    {:<20} {:>8.1f} us/call {:>6.1f}x".format(label,
+                                                        seconds * 1e6,
+                                                        baseline / seconds))
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,4 @@
-from copy import deepcopy
+from copy import copy, deepcopy
 
 from games.havannah.color import Color
 from games.havannah.havannah_action import HavannahAction
@@ -6,6 +6,20 @@ from games.havannah.havannah_board import HavannahBoard
 from games.havannah.havannah_display import HavannahDisplay
 
 from willsmith.game import Game
+from willsmith.indexed_set import IndexedSet
+
+import games.havannah.hex_math as hm
+
+
+def _generate_player_actions():
+    """
+    Return the actions of each player, Blue then Red, in 
+    agent id -> coord -> action dictionaries.
+    """
+    coords = [hm.index_to_cubic(HavannahBoard.BOARD_SIZE, index) 
+                for index in range(hm.num_hexes(HavannahBoard.BOARD_SIZE))]
+    return [{coord : HavannahAction(coord, color) for coord in coords}
+                for color in [Color.BLUE, Color.RED]]
 
 
 class Havannah(Game):
@@ -29,8 +43,10 @@ class Havannah(Game):
     """
 
     ACTION = HavannahAction
+    ACTION_SPACE_SIZE = hm.num_hexes(HavannahBoard.BOARD_SIZE)
     DISPLAY = HavannahDisplay
     NUM_PLAYERS = 2
+    PLAYER_ACTIONS = _generate_player_actions()
 
     def __init__(self, use_display):
         super().__init__(use_display)
@@ -40,39 +56,48 @@ class Havannah(Game):
         """
         Generate the board and the initial legal actions for the game.  
 
-        Actions are stored in a coord -> action dictionary to provide fast 
-        checking if a position is legal and also allow easy updating of the 
-        color attribute of the actions when get_legal_actions is called.
+        Legal coordinates are stored in an IndexedSet to provide fast 
+        checking if a position is legal and fast random choice of a legal 
+        position.  The actions themselves are interned, and looked up in the 
+        PLAYER_ACTIONS tables generated at import and shared by every game.
         """
         self.board = HavannahBoard()
-        self.legal_actions = self._generate_initial_legal_actions()
+        self.legal_positions = IndexedSet(self.board.grid.keys())
 
-    def _generate_initial_legal_actions(self):
-        cur_color = self._agent_id_to_color(self.current_agent_id)
-        return {coord : self.ACTION(coord, cur_color) 
-                    for coord in self.board.grid.keys()}
-    
     def _get_legal_actions(self):
-        self._update_legal_actions()
-        return list(self.legal_actions.values())
+        actions = self.PLAYER_ACTIONS[self.current_agent_id]
+        return [actions[coord] for coord in self.legal_positions]
+
+    def _num_legal_actions(self):
+        return len(self.legal_positions)
 
-    def _update_legal_actions(self):
+    def _random_legal_action(self, rng):
+        actions = self.PLAYER_ACTIONS[self.current_agent_id]
+        return actions[self.legal_positions.choice(rng)]
+
+    def ordered_legal_actions(self):
         """
-        Update each of the actions stored in the legal_actions dictionary to 
-        the current color.
+        Order the legal actions by the number of stones on neighboring hexes, 
+        most first.
 
-        Used to keep get_legal_actions result in sync with the game.
+        Play in Havannah happens around the existing stones, where groups are 
+        extended and blocked.
         """
-        cur_color = self._agent_id_to_color(self.current_agent_id)
-        for action in self.legal_actions.values():
-            action.color = cur_color
+        grid = self.board.grid
+        num_stones = lambda action: sum([grid[neighbor].color != Color.BLANK 
+                                            for neighbor in grid[action.coord].neighbors])
+        return sorted(self.get_legal_actions(), key = num_stones, reverse = True)
+
+    def action_from_index(self, index):
+        coord = hm.index_to_cubic(self.board.BOARD_SIZE, index)
+        return self.PLAYER_ACTIONS[self.current_agent_id][coord]
 
     def is_legal_action(self, action):
         """
         Check that the action's position is legal and that the action's color 
         matches the expected color for the current turn.
         """
-        legal_position = action.coord in self.legal_actions
+        legal_position = action.coord in self.legal_positions
         legal_color = action.color == self._agent_id_to_color(self.current_agent_id) 
         return legal_position and legal_color
 
@@ -83,7 +108,17 @@ class Havannah(Game):
         """
         self.board.take_action(action)
         self.board.check_for_winner(action)
-        del self.legal_actions[action.coord]
+        self.legal_positions.remove(action.coord)
+        self.zobrist_key ^= self.zobrist_table[self.current_agent_id][action.to_index()]
+
+    def _undo_action(self, action):
+        """
+        Revert the action on the game board and return its position to the 
+        set of legal positions.
+        """
+        self.board.undo_action(action)
+        self.legal_positions.add(action.coord)
+        self.zobrist_key ^= self.zobrist_table[self.current_agent_id][action.to_index()]
 
     def get_winning_id(self):
         winner = self.board.get_winner()
@@ -92,7 +127,7 @@ class Havannah(Game):
         return winner
 
     def is_terminal(self):
-        return not self.legal_actions or self.board.get_winner() is not None
+        return not self.legal_positions or self.board.get_winner() is not None
 
     def _agent_id_to_color(self, agent_id):
         lookup = {0 : Color.BLUE, 1 : Color.RED}
@@ -110,12 +145,15 @@ class Havannah(Game):
         if isinstance(self, other.__class__):
             equal = (super().__eq__(other)
                         and self.board == other.board 
-                        and self.legal_actions == other.legal_actions)
+                        and self.legal_positions == other.legal_positions)
         return equal
 
     def __hash__(self):
-        return hash((self.num_agents, self.current_agent_id, 
-                        frozenset(self.legal_actions), self.board))
+        return self.zobrist_key
+
+    def _copy_into(self, dest):
+        self.board.copy_into(dest.board)
+        self.legal_positions.copy_into(dest.legal_positions)
 
     def __deepcopy__(self, memo):
         new = Havannah.__new__(Havannah)
@@ -123,6 +161,5 @@ class Havannah(Game):
         self.deepcopy_game_attrs(new)
 
         new.board = deepcopy(self.board, memo)
-        new.legal_actions = {k : deepcopy(v, memo) 
-                                for k, v in self.legal_actions.items()}
+        new.legal_positions = copy(self.legal_positions)
         return new
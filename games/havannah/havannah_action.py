@@ -1,4 +1,7 @@
 from games.havannah.color import Color
+from games.havannah.havannah_board import HavannahBoard
+
+import games.havannah.hex_math as hm
 
 from willsmith.action import Action
 
@@ -9,16 +12,29 @@ class HavannahAction(Action):
 
     coordinate - cubic hex coordinate in the form (x,y,z)
     color - Blue or Red, corresponding to the player's label
+
+    Actions are interned and immutable.  Constructing an action returns the 
+    one instance for its coordinate and color, so equality and hashing are 
+    by identity, and copies of an action are the action itself.
     """
 
     INPUT_PROMPT = "Choose position and color(x,y,z;Color):  "
-    
+
+    __slots__ = ("coord", "color")
+    _instances = dict()     # (coord, color) : action
+
+    def __new__(cls, coordinate, color):
+        action = cls._instances.get((coordinate, color))
+        if action is None:
+            action = super().__new__(cls)
+            object.__setattr__(action, "coord", coordinate)
+            object.__setattr__(action, "color", color)
+            cls._instances[(coordinate, color)] = action
+        return action
+
     def __init__(self, coordinate, color):
         super().__init__()
 
-        self.coord = coordinate
-        self.color = color
-
     @staticmethod
     def parse_action(input_str):
         try:
@@ -31,24 +47,26 @@ class HavannahAction(Action):
 
         return action
 
+    def to_index(self):
+        return hm.cubic_to_index(HavannahBoard.BOARD_SIZE, *self.coord)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("HavannahAction is immutable.")
+
     def __str__(self):
         return "{} -> {}".format(self.coord, self.color)
 
     def __repr__(self):
         return self.__str__()
 
-    def __eq__(self, other):
-        equal = False
-        if isinstance(self, other.__class__):
-            equal = self.coord == other.coord and self.color == other.color
-        return equal
+    __eq__ = object.__eq__
+    __hash__ = object.__hash__
+
+    def __reduce__(self):
+        return (HavannahAction, (self.coord, self.color))
 
-    def __hash__(self):
-        return hash((self.coord, self.color))
+    def __copy__(self):
+        return self
 
     def __deepcopy__(self, memo):
-        new = HavannahAction.__new__(HavannahAction)
-        memo[id(self)] = new
-        new.coord = self.coord
-        new.color = self.color
-        return new
+        return self
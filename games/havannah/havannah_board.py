@@ -1,4 +1,4 @@
-from copy import deepcopy
+from copy import copy, deepcopy
 from collections import defaultdict
 from itertools import combinations
 
@@ -27,6 +27,10 @@ class HavannahBoard:
     board, a hex that is colored is unioned with its same color neighbors to
     create subsets that store progress towards a win condition.
 
+    Every action taken keeps a record of the unions it performed, so that it 
+    can be undone exactly.  For the same reason the union-find does not use 
+    path compression, union by size alone keeps the trees shallow.
+
     The coordinates start at (0,0,0) in the center of the board, and each
     coordinate on the board has the property that x + y + z = 0.
     """
@@ -36,6 +40,7 @@ class HavannahBoard:
     def __init__(self):
         self.grid = self._generate_hexes(self.BOARD_SIZE)
         self.winner = None
+        self.history = []
 
     def _generate_hexes(self, board_size):
         """
@@ -62,22 +67,54 @@ class HavannahBoard:
         This check is done here because the condition that leads to the 
         fastest check_ring implementation is easiest to detect AFTER an 
         action is taking and BEFORE that node is unioned with others.
+
+        The winner prior to the action and the unions performed are recorded 
+        for undo_action.
         """
         self.grid[action.coord].color = action.color
 
         subset_dict = self._detect_potential_ring(action.coord, action.color)
-        self._union_with_neighbors(action.coord, action.color)
+        unions = self._union_with_neighbors(action.coord, action.color)
+        self.history.append((action.coord, self.winner, unions))
         
         if subset_dict:
             self._check_ring(action.coord, action.color, subset_dict)
 
+    def undo_action(self, action):
+        """
+        Revert the most recent action taken on the board.
+
+        The recorded unions are reverted in the opposite order they were 
+        performed, restoring each absorbed root and the win progress of the 
+        root it was merged into.
+        """
+        coord, winner, unions = self.history.pop()
+        if coord != action.coord:
+            raise RuntimeError("Can only undo the most recent action.")
+
+        for child_coord, root_coord, size, num_corners, edge_labels in reversed(unions):
+            self.grid[child_coord].parent = child_coord
+            root = self.grid[root_coord]
+            root.size = size
+            root.num_corners = num_corners
+            root.edge_labels = set(edge_labels)
+
+        self.grid[coord].color = Color.BLANK
+        self.winner = winner
+
     def _union_with_neighbors(self, coord, color):
         """
         Call _union method on coord with each of its same color neighbors.
+
+        Return the list of union records needed to revert the unions.
         """
+        unions = []
         for neighbor in self.grid[coord].neighbors:
             if self.grid[neighbor].color == color:
-                self._union(coord, neighbor)
+                record = self._union(coord, neighbor)
+                if record is not None:
+                    unions.append(record)
+        return unions
 
     def _union(self, coord1, coord2):
         """
@@ -94,34 +131,40 @@ class HavannahBoard:
         * other subset that has progress towards a win.
         *
         * Only reference root nodes when checking win progress.
+
+        Return a record of the absorbed root and the previous state of the 
+        new root, or None if the coordinates were already connected.
         """
         # retrieve nodes referenced by the coordinates
         root1 = self.grid[self._find(coord1)]
         root2 = self.grid[self._find(coord2)]
 
-        if root1 != root2:  # no need to union if they are already connected
+        record = None
+        if root1 is not root2:  # no need to union if they are already connected
             if root1.size < root2.size:     # ensure larger subset is first
                 root1, root2 = root2, root1
 
+            record = (root2.coord, root1.coord, root1.size, 
+                        root1.num_corners, frozenset(root1.edge_labels))
+
             root2.parent = root1.coord
             root1.size += root2.size
 
             root1.update_win_progress(root2)
+        return record
 
     def _find(self, coord):
         """
         Traverse from the node referenced by the coordinate to its root node.
         Then return the coordinate of the root node.
 
-        During the traversal, parent coordinates are updated with coords
-        from further up in the tree.  This has a flattening effect to keep
-        the number of traversal steps low.
+        Parent coordinates are not compressed during the traversal, so that 
+        the unions recorded for undo_action remain valid.  Union by size 
+        keeps the number of traversal steps logarithmic.
         """
         node = self.grid[coord]
         while not node.is_root():
-            next_node = self.grid[node.parent]
-            node.parent = next_node.parent
-            node = next_node
+            node = self.grid[node.parent]
 
         return node.coord
 
@@ -322,9 +365,21 @@ class HavannahBoard:
     def __hash__(self):
         return hash((self.winner, frozenset(self.grid)))
 
+    def copy_into(self, dest):
+        """
+        Overwrite another board of the same size with this board, reusing 
+        its hex nodes.
+        """
+        dest_grid = dest.grid
+        for coord, node in self.grid.items():
+            node.copy_into(dest_grid[coord])
+        dest.winner = self.winner
+        dest.history[:] = self.history
+
     def __deepcopy__(self, memo):
         new = HavannahBoard.__new__(HavannahBoard)
         memo[id(self)] = new
         new.grid = {k:deepcopy(v, memo) for k, v in self.grid.items()}
         new.winner = self.winner
+        new.history = copy(self.history)
         return new
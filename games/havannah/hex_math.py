@@ -6,6 +6,9 @@ dictionary is used to dynamically generate all of the move operations on
 module import.  
 
 Dynamic function names are all in the form cubic_dir or axial_dir.
+
+Coordinates can also be converted to and from a dense index in the range 
+[0, num_hexes(board_size)), used as the action index in Havannah.
 """
 
 
@@ -51,6 +54,45 @@ def axial_n_moves(f, n, col, slant):
         col, slant = f(col, slant)
     return col, slant
 
+_index_tables = dict()     # board size : (index -> coord list, coord -> index dict)
+
+def num_hexes(board_size):
+    """
+    Return the number of hexes on a board with sides of length board_size.
+    """
+    return 3 * board_size * (board_size - 1) + 1
+
+def cubic_to_index(board_size, x, y, z):
+    """
+    Convert cubic coordinate to its dense index on a board of the given size.
+
+    Raises a KeyError for coordinates outside of the board.
+    """
+    return _get_index_table(board_size)[1][(x, y, z)]
+
+def index_to_cubic(board_size, index):
+    """
+    Convert a dense index on a board of the given size to its cubic 
+    coordinate.
+    """
+    return _get_index_table(board_size)[0][index]
+
+def _get_index_table(board_size):
+    """
+    Return the tables converting between indices and coordinates, 
+    generating them on the first request for a board size.
+
+    Indices follow the coordinate order of HavannahBoard's grid.
+    """
+    if board_size not in _index_tables:
+        coords = [(x, y, z) for x in range(-board_size + 1, board_size)
+                            for y in range(-board_size + 1, board_size)
+                            for z in range(-board_size + 1, board_size)
+                                if x + y + z == 0]
+        _index_tables[board_size] = (coords, 
+                                        {coord : i for i, coord in enumerate(coords)})
+    return _index_tables[board_size]
+
 def _cubic_move_gen(delta):
     def f(x, y, z):
         return tuple([a + b for a, b in zip((x, y, z), delta)])
@@ -111,6 +111,18 @@ class HexNode:
                 neighbors.append(new_tuple)
         return neighbors
 
+    def copy_into(self, dest):
+        """
+        Overwrite the mutable attributes of the node at the same coordinate 
+        of another board.
+        """
+        dest.parent = self.parent
+        dest.size = self.size
+        dest.color = self.color
+        dest.num_corners = self.num_corners
+        dest.edge_labels.clear()
+        dest.edge_labels.update(self.edge_labels)
+
     def __deepcopy__(self, memo):
         new = HexNode.__new__(HexNode)
         memo[id(self)] = new
@@ -1,4 +1,4 @@
-from copy import deepcopy
+from copy import copy, deepcopy
 
 from games.ttt.ttt_action import TTTAction
 from games.ttt.ttt_board import TTTBoard
@@ -6,6 +6,23 @@ from games.ttt.ttt_display import TTTDisplay
 from games.ttt.ttt_move import TTTMove
 
 from willsmith.game import Game
+from willsmith.indexed_set import IndexedSet
+
+
+def _generate_positions():
+    return [((r, c), (ir, ic)) for r in range(TTTBoard.BOARD_SIZE)
+                for c in range(TTTBoard.BOARD_SIZE)
+                    for ir in range(TTTBoard.BOARD_SIZE)
+                    for ic in range(TTTBoard.BOARD_SIZE)]
+
+def _generate_player_actions():
+    """
+    Return the actions of each player, X then O, in 
+    agent id -> (outer_pos, inner_pos) -> action dictionaries.
+    """
+    return [{(outer_pos, inner_pos) : TTTAction(outer_pos, inner_pos, move) 
+                for outer_pos, inner_pos in _generate_positions()}
+                    for move in [TTTMove.X, TTTMove.O]]
 
 
 class NestedTTT(Game):
@@ -28,8 +45,10 @@ class NestedTTT(Game):
     """
 
     ACTION = TTTAction
+    ACTION_SPACE_SIZE = TTTBoard.BOARD_SIZE ** 4
     DISPLAY = TTTDisplay
     NUM_PLAYERS = 2
+    PLAYER_ACTIONS = _generate_player_actions()
 
     def __init__(self, use_display):
         super().__init__(use_display)
@@ -45,30 +64,53 @@ class NestedTTT(Game):
         The set of legal board positions, one pair of 
         position for each, is also initialized.  This enables faster checking 
         if a move is legal, and also faster generation of the available legal 
-        actions in get_legal_actions.
+        actions in get_legal_actions.  The actions themselves are interned, 
+        and looked up in the PLAYER_ACTIONS tables generated at import and 
+        shared by every game.
         """
         self.outer_board = TTTBoard()
         self.inner_boards = [[TTTBoard() for _ in range(TTTBoard.BOARD_SIZE)] 
                                 for _ in range(TTTBoard.BOARD_SIZE)]
 
-        self.legal_actions = self._generate_initial_legal_actions()
-
-    def _generate_initial_legal_actions(self):
-        cur_move = self._agent_id_to_move(self.current_agent_id)
-        return {((r, c), (ir, ic)) : self.ACTION((r, c), (ir, ic), cur_move) 
-                    for r in range(TTTBoard.BOARD_SIZE)
-                    for c in range(TTTBoard.BOARD_SIZE)
-                        for ir in range(TTTBoard.BOARD_SIZE)
-                        for ic in range(TTTBoard.BOARD_SIZE)}
+        self.legal_positions = IndexedSet(_generate_positions())
+        self.removed_history = []
 
     def _get_legal_actions(self):
-        self._update_legal_actions()
-        return list(self.legal_actions.values())
+        actions = self.PLAYER_ACTIONS[self.current_agent_id]
+        return [actions[position] for position in self.legal_positions]
+
+    def _num_legal_actions(self):
+        return len(self.legal_positions)
+
+    def _random_legal_action(self, rng):
+        actions = self.PLAYER_ACTIONS[self.current_agent_id]
+        return actions[self.legal_positions.choice(rng)]
+
+    def ordered_legal_actions(self):
+        """
+        Order the legal actions by the number of winning lines through their 
+        inner position, so the center comes first, then the corners, then 
+        the edges.
+        """
+        return sorted(self.get_legal_actions(), 
+                        key = lambda action: self._num_lines(action.inner_pos), 
+                        reverse = True)
 
-    def _update_legal_actions(self):
-        cur_move = self._agent_id_to_move(self.current_agent_id)
-        for action in self.legal_actions.values():
-            action.move = cur_move
+    @staticmethod
+    def _num_lines(position):
+        r, c = position
+        last = TTTBoard.BOARD_SIZE - 1
+        return 2 + (r == c) + (r + c == last)
+
+    def action_from_index(self, index):
+        """
+        Decode the index as the base 3 digits of the outer and inner 
+        positions, see TTTAction.to_index.
+        """
+        outer, inner = divmod(index, TTTBoard.BOARD_SIZE ** 2)
+        position = (divmod(outer, TTTBoard.BOARD_SIZE), 
+                    divmod(inner, TTTBoard.BOARD_SIZE))
+        return self.PLAYER_ACTIONS[self.current_agent_id][position]
 
     def get_winning_id(self):
         winner_id = None
@@ -81,7 +123,7 @@ class NestedTTT(Game):
         Check that the action's position is legal and that the action's move 
         matches the expected move for the current turn.
         """
-        legal_position = (action.outer_pos, action.inner_pos) in self.legal_actions
+        legal_position = (action.outer_pos, action.inner_pos) in self.legal_positions
         legal_move = action.move == self._agent_id_to_move(self.current_agent_id)
         return legal_position and legal_move
 
@@ -102,6 +144,7 @@ class NestedTTT(Game):
             self.outer_board.check_for_winner(action.move)
 
         self._remove_illegal_actions(action.outer_pos, action.inner_pos, board_won)
+        self.zobrist_key ^= self.zobrist_table[self.current_agent_id][action.to_index()]
 
     def _remove_illegal_actions(self, outer_pos, inner_pos, board_won):
         """
@@ -109,19 +152,40 @@ class NestedTTT(Game):
 
         If the position won the board, all the remaining open squares on 
         that inner board are now illegal and removed as well.
+
+        The removed positions are recorded so that _undo_action can restore 
+        them.
         """
-        del self.legal_actions[(outer_pos, inner_pos)]
+        removed = [(outer_pos, inner_pos)]
+        self.legal_positions.remove((outer_pos, inner_pos))
         if board_won:
             for r in range(TTTBoard.BOARD_SIZE):
                 for c in range(TTTBoard.BOARD_SIZE):
                     try:
-                        del self.legal_actions[(outer_pos, (r, c))]
+                        self.legal_positions.remove((outer_pos, (r, c)))
+                        removed.append((outer_pos, (r, c)))
                     except KeyError:    # moves that have already been taken
                         pass
+        self.removed_history.append(removed)
+
+    def _undo_action(self, action):
+        """
+        Revert the action on its inner board, and on the outer board if it 
+        won the inner board.  Then restore the positions it made illegal.
+        """
+        r, c = action.outer_pos
+        board = self.inner_boards[r][c]
+        if board.get_winner() is not None:
+            self.outer_board.undo_action(action.outer_pos)
+        board.undo_action(action.inner_pos)
+
+        for position in self.removed_history.pop():
+            self.legal_positions.add(position)
+        self.zobrist_key ^= self.zobrist_table[self.current_agent_id][action.to_index()]
 
     def is_terminal(self):
         is_winner = self.outer_board.get_winner() is not None
-        moves_left = bool(self.legal_actions)
+        moves_left = bool(self.legal_positions)
         return is_winner or not moves_left
 
     def _agent_id_to_move(self, agent_id):
@@ -163,13 +227,19 @@ class NestedTTT(Game):
             equal = (super().__eq__(other)
                         and self.outer_board == other.outer_board
                         and self.inner_boards == other.inner_boards
-                        and self.legal_actions == other.legal_actions)
+                        and self.legal_positions == other.legal_positions)
         return equal
 
     def __hash__(self):
-        return hash((self.num_agents, self.current_agent_id, 
-                        self.outer_board, self.inner_boards, 
-                        frozenset(self.legal_actions)))
+        return self.zobrist_key
+
+    def _copy_into(self, dest):
+        self.outer_board.copy_into(dest.outer_board)
+        for row, dest_row in zip(self.inner_boards, dest.inner_boards):
+            for board, dest_board in zip(row, dest_row):
+                board.copy_into(dest_board)
+        self.legal_positions.copy_into(dest.legal_positions)
+        dest.removed_history[:] = self.removed_history
 
     def __deepcopy__(self, memo):
         new = NestedTTT.__new__(NestedTTT)
@@ -178,6 +248,6 @@ class NestedTTT(Game):
 
         new.outer_board = deepcopy(self.outer_board, memo)
         new.inner_boards = [deepcopy(board, memo) for board in self.inner_boards]
-        new.legal_actions = {k : deepcopy(v, memo) 
-                                for k, v in self.legal_actions.items()}
+        new.legal_positions = copy(self.legal_positions)
+        new.removed_history = copy(self.removed_history)
         return new
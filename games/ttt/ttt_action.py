@@ -1,3 +1,4 @@
+from games.ttt.ttt_board import TTTBoard
 from games.ttt.ttt_move import TTTMove
 
 from willsmith.action import Action
@@ -10,17 +11,31 @@ class TTTAction(Action):
     Outer position - selects a board
     Inner position - selects a position on that board
     Move - X or O, corresponding to player's label
+
+    Actions are interned and immutable.  Constructing an action returns the 
+    one instance for its positions and move, so equality and hashing are by 
+    identity, and copies of an action are the action itself.
     """
 
     INPUT_PROMPT = "Choose board, board position, and move(r,c;r,c;Move):  "
 
+    __slots__ = ("outer_pos", "inner_pos", "move")
+    _instances = dict()     # (outer_pos, inner_pos, move) : action
+
+    def __new__(cls, outer_pos, inner_pos, move):
+        key = (outer_pos, inner_pos, move)
+        action = cls._instances.get(key)
+        if action is None:
+            action = super().__new__(cls)
+            object.__setattr__(action, "outer_pos", outer_pos)
+            object.__setattr__(action, "inner_pos", inner_pos)
+            object.__setattr__(action, "move", move)
+            cls._instances[key] = action
+        return action
+
     def __init__(self, outer_pos, inner_pos, move):
         super().__init__()
 
-        self.outer_pos = outer_pos
-        self.inner_pos = inner_pos
-        self.move = move
-
     @staticmethod
     def parse_action(input_str):
         try:
@@ -33,24 +48,30 @@ class TTTAction(Action):
             action = None
         return action
 
+    def to_index(self):
+        """
+        Encode the outer and inner positions as the digits of a base 3 
+        number, in row-major order.
+        """
+        bs = TTTBoard.BOARD_SIZE
+        r, c = self.outer_pos
+        ir, ic = self.inner_pos
+        return ((r * bs + c) * bs + ir) * bs + ic
+
+    def __setattr__(self, name, value):
+        raise AttributeError("TTTAction is immutable.")
+
     def __str__(self):
         return "{},{} -> {}".format(self.outer_pos, self.inner_pos, self.move)
 
-    def __eq__(self, other):
-        equal = False
-        if isinstance(self, other.__class__):
-            equal = (self.outer_pos == other.outer_pos and 
-                        self.inner_pos == other.inner_pos and 
-                        self.move == other.move)
-        return equal
+    __eq__ = object.__eq__
+    __hash__ = object.__hash__
+
+    def __reduce__(self):
+        return (TTTAction, (self.outer_pos, self.inner_pos, self.move))
 
-    def __hash__(self):
-        return hash((self.outer_pos, self.inner_pos, self.move))
+    def __copy__(self):
+        return self
 
     def __deepcopy__(self, memo):
-        new = TTTAction.__new__(TTTAction)
-        memo[id(self)] = new
-        new.outer_pos = self.outer_pos
-        new.inner_pos = self.inner_pos
-        new.move = self.move
-        return new
+        return self
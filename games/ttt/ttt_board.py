@@ -45,6 +45,17 @@ class TTTBoard:
         r, c = position
         self.board[r][c] = move
 
+    def undo_action(self, position):
+        """
+        Reverts the board position to blank.
+
+        A board only accepts moves while it has no winner, so undoing any 
+        move also clears the winner.
+        """
+        r, c = position
+        self.board[r][c] = TTTMove.BLANK
+        self.winner = None
+
     def get_winner(self):
         """
         Returns the move that won the board or None if it is still ongoing.
@@ -77,6 +88,14 @@ class TTTBoard:
     def __hash__(self):
         return hash((self.winner, frozenset(self.board)))
 
+    def copy_into(self, dest):
+        """
+        Overwrite another board with this board, reusing its rows.
+        """
+        for row, dest_row in zip(self.board, dest.board):
+            dest_row[:] = row
+        dest.winner = self.winner
+
     def __deepcopy__(self, memo):
         new = TTTBoard.__new__(TTTBoard)
         memo[id(self)] = new
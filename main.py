@@ -10,10 +10,15 @@ See README.md for a full-project breakdown.
 
 from argparse import ArgumentParser
 from logging import FileHandler, Formatter, StreamHandler, DEBUG, INFO, getLogger
+import sys
 
+from agents.array_mcts_agent import ArrayMCTSAgent
 from agents.human_agent import HumanAgent
 from agents.mcts_agent import MCTSAgent
+from agents.playout_policy import LastGoodReplyPolicy, MASTPolicy
 from agents.random_agent import RandomAgent
+from agents.root_parallel_mcts_agent import RootParallelMCTSAgent
+from agents.tree_parallel_mcts_agent import TreeParallelMCTSAgent
 from agents.gridworld_approx_qlearning_agent import GridworldApproxQLearningAgent
 
 from games.havannah.havannah import Havannah
@@ -27,10 +32,20 @@ __version__ = "0.6.0"
 
 HAVANNAH_LABELS = ["Havannah", "hav"]
 NESTEDTTT_LABELS = ["NestedTTT", "ttt"]
-GAME_AGENT_LABELS = ["mcts", "rand", "human"]
+GAME_AGENT_LABELS = ["mcts", "amcts", "pmcts", "tmcts", "rand", "human"]
 DEFAULT_GAME_AGENTS = ["mcts", "rand"]
 DEFAULT_TIME_ALLOTTED = 0.5
 DEFAULT_NUM_GAMES = 1
+DEFAULT_NUM_WORKERS = None   # one per CPU
+DEFAULT_TIME_BANK = None    # no limit besides the time allotted per move
+DEFAULT_PLAYOUT_BUDGET = None   # search for the time allotted
+DEFAULT_MAX_NODES = None  # unlimited
+DEFAULT_TREE_FILE = None
+DEFAULT_LEAF_PLAYOUTS = 1
+PLAYOUT_POLICY_LABELS = ["random", "mast", "lgr"]
+DEFAULT_PLAYOUT_POLICY = "random"
+DEFAULT_HALVING_CANDIDATES = None   # UCT at the root
+DEFAULT_SEED = None
 
 GRIDWORLD_LABELS = ["Gridworld", "grid"]
 MDP_AGENT_LABELS = ["approxql"]
@@ -107,6 +122,36 @@ def create_parser():
     game_parser.add_argument("-t", "--time_allotted", type = float,
                                 default = DEFAULT_TIME_ALLOTTED,
                                 help = "Time allotted for agent moves")
+    game_parser.add_argument("-w", "--workers", type = int,
+                                default = DEFAULT_NUM_WORKERS,
+                                help = "Number of worker processes or threads for parallel agents, defaults to the number of CPUs")
+    game_parser.add_argument("-p", "--ponder", action = "store_true",
+                                help = "MCTS agents keep searching during the other agent's turn.  With the GIL, the pondering thread takes CPU time from the agent that is searching")
+    game_parser.add_argument("-b", "--time_bank", type = float,
+                                default = DEFAULT_TIME_BANK,
+                                help = "Total search time per game for MCTS agents, shared out across their moves")
+    game_parser.add_argument("-l", "--playout_budget", type = int,
+                                default = DEFAULT_PLAYOUT_BUDGET,
+                                help = "Fixed number of playouts per move for MCTS agents, used instead of the time allotted")
+    game_parser.add_argument("-m", "--max_nodes", type = int,
+                                default = DEFAULT_MAX_NODES,
+                                help = "Maximum number of nodes in the tree of MCTS agents")
+    game_parser.add_argument("-f", "--tree_file", type = str,
+                                default = DEFAULT_TREE_FILE,
+                                help = "Path prefix of the files MCTS agents save their opening trees to, and load them from")
+    game_parser.add_argument("-k", "--leaf_playouts", type = int,
+                                default = DEFAULT_LEAF_PLAYOUTS,
+                                help = "Number of playouts MCTS agents run from each new leaf")
+    game_parser.add_argument("-o", "--playout_policy", type = str,
+                                default = DEFAULT_PLAYOUT_POLICY,
+                                choices = PLAYOUT_POLICY_LABELS,
+                                help = "Policy MCTS agents choose simulation actions with")
+    game_parser.add_argument("-e", "--sequential_halving", type = int,
+                                default = DEFAULT_HALVING_CANDIDATES,
+                                help = "Number of root actions MCTSAgent narrows down by sequential halving instead of UCT")
+    game_parser.add_argument("-s", "--seed", type = int,
+                                default = DEFAULT_SEED,
+                                help = "Seed for the random number generator, for reproducible games")
 
     mdp_parser = subparser.add_parser("mdp", help = "Simulate an MDP")
     mdp_parser.add_argument("mdp_choice", type = str,
@@ -129,7 +174,10 @@ def create_parser():
     return parser
 
 def lookup_agent(num, agent_str):
-    lookup = {"mcts" : MCTSAgent, "rand" : RandomAgent, "human" : HumanAgent}
+    lookup = {"mcts" : MCTSAgent, "amcts" : ArrayMCTSAgent, 
+                "pmcts" : RootParallelMCTSAgent, 
+                "tmcts" : TreeParallelMCTSAgent, "rand" : RandomAgent, 
+                "human" : HumanAgent}
     try:
         agent_class = lookup[agent_str]
     except KeyError:
@@ -146,6 +194,17 @@ def lookup_mdp_agent(agent_str, mdp):
         raise RuntimeError("Unexpected agent string type.")
     return agent_class
 
+def lookup_playout_policy(policy_str):
+    """
+    Return a new instance of the playout policy, or None for light playouts.
+    """
+    lookup = {"random" : None, "mast" : MASTPolicy, "lgr" : LastGoodReplyPolicy}
+    try:
+        policy_class = lookup[policy_str]
+    except KeyError:
+        raise RuntimeError("Unexpected playout policy type.")
+    return policy_class() if policy_class is not None else None
+
 def lookup_game(game_str):
     if game_str in NESTEDTTT_LABELS:
         game_class = NestedTTT
@@ -176,20 +235,53 @@ def determine_display(no_display, console_display):
         getLogger().debug("Console display option chosen")
     return gui
 
+def create_agent(num, agent_class, use_gui, game, args):
+    """
+    Instantiate the agent, passing along the arguments specific to its class.
+    """
+    if agent_class is HumanAgent:
+        agent = agent_class(num, use_gui, game.ACTION)
+    elif agent_class in [RootParallelMCTSAgent, TreeParallelMCTSAgent]:
+        agent = agent_class(num, use_gui, args.workers)
+    elif agent_class in [MCTSAgent, ArrayMCTSAgent]:
+        kwargs = dict()
+        if agent_class is MCTSAgent and args.tree_file is not None:
+            kwargs["tree_file"] = "{}_{}.npy".format(args.tree_file, num)
+        if agent_class is MCTSAgent:
+            kwargs["sequential_halving"] = args.sequential_halving
+        agent = agent_class(num, use_gui, ponder = args.ponder, 
+                            time_bank = args.time_bank, 
+                            playout_budget = args.playout_budget, 
+                            max_nodes = args.max_nodes, 
+                            leaf_playouts = args.leaf_playouts, 
+                            playout_policy = lookup_playout_policy(args.playout_policy), 
+                            **kwargs)
+    else:
+        agent = agent_class(num, use_gui)
+    return agent
+
+def gil_enabled():
+    """
+    Return a boolean indicating if the interpreter runs threads under the 
+    GIL, which is always the case before Python 3.13.
+    """
+    is_gil_enabled = getattr(sys, "_is_gil_enabled", lambda: True)
+    return is_gil_enabled()
+
 def process_game_args(args, use_gui):
     """
     """
+    if args.ponder and gil_enabled():
+        getLogger().warning("Pondering shares the CPU with the searching agent under the GIL, so it slows that agent down rather than adding search time.")
     game = lookup_game(args.game_choice)(use_gui)
     agent_classes = [lookup_agent(i, agent_str) 
                         for i, agent_str in enumerate(args.agents)]
-    agents = [(agent(i, use_gui) 
-                            if agent is not HumanAgent 
-                            else agent(i, use_gui, game.ACTION))
+    agents = [create_agent(i, agent, use_gui, game, args)
                             for i, agent in enumerate(agent_classes)]
 
     getLogger().debug("Agents have {} seconds per turn".format(args.time_allotted))
     getLogger().debug("{} game(s) will be played".format(args.num_games))
-    return [game, agents, args.time_allotted, args.num_games]
+    return [game, agents, args.time_allotted, args.num_games, args.seed]
 
 def process_mdp_args(args, use_gui):
     """
@@ -32,5 +32,6 @@ setup(
     python_requires = ">=3",
     py_modules = ["main"],
     packages = find_packages(),
+    install_requires = ["numpy"],
     test_suite = "tests"
 )
@@ -0,0 +1,49 @@
+from unittest import TestCase
+
+from agents.array_mcts_agent import ArrayMCTSAgent
+
+from games.ttt.nested_ttt import NestedTTT
+
+
+class TestArrayMCTSAgent(TestCase):
+
+    def setUp(self):
+        self.agent = ArrayMCTSAgent(0, False)
+        self.game = NestedTTT(None)
+
+    def test_search_returns_legal_action(self):
+        action = self.agent.search(self.game, 0.05)
+        self.assertIn(action, self.game.get_legal_actions())
+
+    def test_take_action_moves_root_to_searched_child(self):
+        action = self.agent.search(self.game, 0.05)
+        child = self.agent.tree.find_child(self.agent.tree.root, 
+                                            action.to_index())
+        child_trials = self.agent.tree.trials[child]
+        self.agent.take_action(action, True)
+        root = self.agent.tree.root
+        self.assertEqual(self.agent.tree.action_index[root], action.to_index())
+        self.assertEqual(self.agent.tree.trials[root], child_trials)
+        self.assertEqual(self.agent.tree.parent[root], -1)
+
+    def test_node_limit_caps_tree(self):
+        agent = ArrayMCTSAgent(0, False, max_nodes = 200)
+        agent.search(self.game, 0.05)
+        self.assertLessEqual(len(agent.tree), 200)
+
+    def test_node_limit_below_branching_factor(self):
+        agent = ArrayMCTSAgent(0, False, max_nodes = 50)
+        action = agent.search(self.game, 0.05)
+        self.assertIn(action, self.game.get_legal_actions())
+        self.assertEqual(len(agent.tree), 1)
+
+    def test_unsupported_options_raise(self):
+        for option in ArrayMCTSAgent.UNSUPPORTED_OPTIONS:
+            with self.assertRaises(RuntimeError):
+                ArrayMCTSAgent(0, False, **{option : 1})
+
+    def test_tree_stats_count_allocated_nodes(self):
+        self.agent.search(self.game, 0.05)
+        stats = self.agent.tree_stats()
+        self.assertEqual(stats["num_nodes"], len(self.agent.tree))
+        self.assertGreaterEqual(stats["max_depth"], 1)
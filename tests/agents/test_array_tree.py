@@ -0,0 +1,91 @@
+from unittest import TestCase
+
+from agents.array_tree import ArrayTree
+
+
+class TestArrayTree(TestCase):
+
+    def setUp(self):
+        self.tree = ArrayTree(capacity = 4)
+
+    def test_add_children_grows_capacity(self):
+        self.tree.add_children(self.tree.root, list(range(10)), 0)
+        self.assertEqual(len(self.tree), 11)
+        self.assertGreaterEqual(self.tree.capacity, 11)
+        self.assertEqual(list(self.tree.action_index[1:11]), list(range(10)))
+        self.assertTrue(all(self.tree.parent[1:11] == self.tree.root))
+
+    def test_is_expanded_after_all_children_visited(self):
+        root = self.tree.root
+        self.assertFalse(self.tree.is_expanded(root))
+        self.tree.add_children(root, [3, 5], 0)
+        self.tree.expand_next_child(root)
+        self.assertFalse(self.tree.is_expanded(root))
+        self.tree.expand_next_child(root)
+        self.assertTrue(self.tree.is_expanded(root))
+
+    def test_backpropagate_updates_path_to_root(self):
+        root = self.tree.root
+        self.tree.add_children(root, [3, 5], 0)
+        child = self.tree.expand_next_child(root)
+        self.tree.add_children(child, [1], 1)
+        grandchild = self.tree.expand_next_child(child)
+
+        self.tree.backpropagate(grandchild, 0)
+        self.assertEqual(self.tree.trials[grandchild], 1)
+        self.assertEqual(self.tree.wins[grandchild], 0)
+        self.assertEqual(self.tree.trials[child], 1)
+        self.assertEqual(self.tree.wins[child], 1)
+        self.assertEqual(self.tree.trials[root], 1)
+
+    def test_find_child_only_visited_children(self):
+        root = self.tree.root
+        self.tree.add_children(root, [3, 5], 0)
+        child = self.tree.expand_next_child(root)
+        self.assertEqual(self.tree.find_child(root, 3), child)
+        self.assertEqual(self.tree.find_child(root, 5), -1)
+
+    def test_uct_child_prefers_higher_win_rate(self):
+        root = self.tree.root
+        self.tree.add_children(root, [3, 5], 0)
+        first = self.tree.expand_next_child(root)
+        second = self.tree.expand_next_child(root)
+        for _ in range(5):
+            self.tree.backpropagate(first, 0)
+            self.tree.backpropagate(second, 1)
+        self.assertEqual(self.tree.uct_child(root), first)
+
+    def test_compact_keeps_only_root_subtree(self):
+        root = self.tree.root
+        self.tree.add_children(root, [3, 5], 0)
+        child = self.tree.expand_next_child(root)
+        sibling = self.tree.expand_next_child(root)
+        self.tree.add_children(sibling, [1, 2], 1)
+        self.tree.add_children(child, [7], 1)
+        grandchild = self.tree.expand_next_child(child)
+        self.tree.backpropagate(grandchild, 1)
+
+        self.tree.set_root(child)
+        self.tree.compact()
+        self.assertEqual(len(self.tree), 2)
+        self.assertEqual(self.tree.root, 0)
+        self.assertEqual(self.tree.action_index[0], 3)
+        self.assertEqual(self.tree.find_child(0, 7), 1)
+        self.assertEqual(self.tree.parent[1], 0)
+        self.assertEqual(self.tree.trials[1], 1)
+        self.assertEqual(self.tree.wins[1], 1)
+
+    def test_has_room_within_max_nodes(self):
+        tree = ArrayTree(max_nodes = 3)
+        self.assertTrue(tree.has_room(2))
+        self.assertFalse(tree.has_room(3))
+
+    def test_backpropagate_results_updates_path_to_root(self):
+        root = self.tree.root
+        self.tree.add_children(root, [3], 0)
+        child = self.tree.expand_next_child(root)
+
+        self.tree.backpropagate_results(child, {0 : 2, 1 : 1, None : 1})
+        self.assertEqual(self.tree.trials[child], 4)
+        self.assertEqual(self.tree.wins[child], 2)
+        self.assertEqual(self.tree.trials[root], 4)
@@ -1,7 +1,14 @@
+import random
+from time import sleep, time
 from unittest import TestCase
 from unittest.mock import patch
 
 from agents.mcts_agent import MCTSAgent
+from agents.playout_policy import MASTPolicy
+
+from games.ttt.nested_ttt import NestedTTT
+from games.ttt.ttt_action import TTTAction
+from games.ttt.ttt_move import TTTMove
 
 
 class TestMCTSAgent(TestCase):
@@ -15,3 +22,277 @@ class TestMCTSAgent(TestCase):
         current_node = None
         returned_node = self.agent._expansion(game, current_node)
         self.assertEqual(current_node, returned_node)
+
+    def test_search_leaves_state_unchanged(self):
+        game = NestedTTT(None)
+        other_game = game.copy()
+        self.agent.search(game, 0.05)
+        self.assertEqual(game, other_game)
+
+    def test_searches_reuse_scratch_state(self):
+        game = NestedTTT(None)
+        self.agent.search(game, 0.01)
+        scratch_state = self.agent.scratch_state
+        game.take_action(TTTAction((0, 0), (0, 0), TTTMove.X))
+        other_game = game.copy()
+        self.agent.search(game, 0.01)
+        self.assertIs(self.agent.scratch_state, scratch_state)
+        self.assertEqual(game, other_game)
+        self.assertEqual(scratch_state, game)
+
+    def test_expansion_shares_transposed_node(self):
+        agent = MCTSAgent(0, False, transposition_table_size = 100)
+        first = TTTAction((0, 0), (0, 0), TTTMove.X)
+        second = TTTAction((1, 1), (1, 1), TTTMove.O)
+        third = TTTAction((2, 2), (2, 2), TTTMove.X)
+
+        new_nodes = []
+        for actions in [[first, second, third], [third, second, first]]:
+            game = NestedTTT(None)
+            node = agent.root
+            for action in actions[:-1]:
+                game.take_action(action)
+                node.add_child(action, MCTSAgent.Node(node, 0))
+                node = node.get_child(action)
+            with patch("agents.mcts_agent.choice", return_value = actions[-1]):
+                new_nodes.append(agent._expansion(game, node))
+        self.assertIs(new_nodes[0], new_nodes[1])
+
+    def test_search_with_transposition_table_bounded(self):
+        agent = MCTSAgent(0, False, transposition_table_size = 10)
+        agent.search(NestedTTT(None), 0.05)
+        self.assertLessEqual(len(agent.transpositions), 10)
+        self.assertEqual(agent.root.trials, agent.playout_total)
+
+    def test_update_rave_counts_later_actions_of_same_agent(self):
+        game = NestedTTT(None)
+        first = TTTAction((0, 0), (0, 0), TTTMove.X)
+        later = TTTAction((1, 1), (1, 1), TTTMove.X)
+        opponent = TTTAction((1, 1), (1, 1), TTTMove.O)
+
+        root = self.agent.root
+        for action in [first, later, opponent]:
+            root.add_child(action, MCTSAgent.Node(root, 0))
+        self.agent._update_rave(0, [root], [first, TTTAction((2, 2), (2, 2), TTTMove.O), later])
+
+        self.assertEqual(root.get_child(first).rave_wins, 1)
+        self.assertEqual(root.get_child(later).rave_trials, 1)
+        self.assertEqual(root.get_child(opponent).rave_trials, 0)
+
+    def test_search_with_rave(self):
+        agent = MCTSAgent(0, False, rave_equivalence = 100)
+        game = NestedTTT(None)
+        action = agent.search(game, 0.05)
+        self.assertIn(action, game.get_legal_actions())
+        self.assertTrue(any([child.rave_trials > child.trials 
+                                for child in agent.root.children.values()]))
+
+    def test_progressive_widening_limits_root_children(self):
+        agent = MCTSAgent(0, False, widening_exponent = 0.2)
+        game = NestedTTT(None)
+        agent.search(game, 0.05)
+        self.assertLess(len(agent.root.children), game.num_legal_actions())
+        self.assertLessEqual(len(agent.root.children), 
+                                (agent.root.trials + 1) ** 0.2 + 1)
+        self.assertTrue(all([action.inner_pos == (1, 1) 
+                                for action in agent.root.children]))
+
+    def test_update_proof_from_children(self):
+        node = MCTSAgent.Node(None, 1)
+        node.num_actions = 2
+        losing_child = MCTSAgent.Node(node, 0)
+        losing_child.prove_terminal(1)
+        node.add_child(0, losing_child)
+        self.assertFalse(node.update_proof())
+
+        winning_child = MCTSAgent.Node(node, 0)
+        winning_child.prove_terminal(0)
+        node.add_child(1, winning_child)
+        self.assertTrue(node.update_proof())
+        self.assertFalse(node.proven_win)
+
+    def test_search_stops_when_root_solved(self):
+        game = NestedTTT(None)
+        filler = [(0, 0), (0, 1), (1, 0), (2, 2)]
+        o_moves = ([((0, 1), pos) for pos in filler] 
+                    + [((1, 0), pos) for pos in filler])
+        x_moves = ([(outer, inner) for outer in [(0, 0), (1, 1)] 
+                        for inner in [(0, 0), (1, 1), (2, 2)]]
+                    + [((2, 2), (0, 0)), ((2, 2), (1, 1))])
+        for x_move, o_move in zip(x_moves, o_moves):
+            game.take_action(TTTAction(*x_move, TTTMove.X))
+            game.take_action(TTTAction(*o_move, TTTMove.O))
+
+        start_time = time()
+        action = self.agent.search(game, 10)
+        self.assertLess(time() - start_time, 10)
+        self.assertFalse(self.agent.root.proven_win)
+        self.assertEqual((action.outer_pos, action.inner_pos), ((2, 2), (2, 2)))
+
+    def test_ponder_grows_tree_until_action_taken(self):
+        agent = MCTSAgent(0, False, ponder = True)
+        game = NestedTTT(None)
+        agent.ponder(game.copy())
+        sleep(0.05)
+        agent._stop_pondering()
+        self.assertGreater(agent.ponder_total, 0)
+        self.assertEqual(agent.root.trials, agent.ponder_total)
+
+        action = agent.root.max_trials()
+        agent.ponder(game.copy())
+        agent.take_action(action, False)
+        self.assertIsNone(agent._ponder_thread)
+        self.assertGreater(agent.root.trials, 0)
+
+    def test_ponder_disabled_by_default(self):
+        self.agent.ponder(NestedTTT(None))
+        self.assertIsNone(self.agent._ponder_thread)
+
+    def test_search_with_empty_time_bank_runs_once(self):
+        agent = MCTSAgent(0, False, time_bank = 0.05)
+        agent.time_manager.spend(1)
+        game = NestedTTT(None)
+        action = agent.search(game, 0.5)
+        self.assertIn(action, game.get_legal_actions())
+        self.assertGreater(agent.playout_total, 0)
+
+    def test_search_single_legal_action_skips_playouts(self):
+        game = NestedTTT(None)
+        game.legal_positions = type(game.legal_positions)([((0, 0), (0, 0))])
+        start_time = time()
+        action = self.agent.search(game, 10)
+        self.assertLess(time() - start_time, 10)
+        self.assertEqual(self.agent.playout_total, 0)
+        self.assertIs(action, game.get_legal_actions()[0])
+
+    def test_best_action_settled_from_root_children(self):
+        root = self.agent.root
+        for trials, action in zip([30, 10], NestedTTT(None).get_legal_actions()):
+            child = MCTSAgent.Node(root, 0)
+            child.trials = trials
+            root.add_child(action, child)
+        self.assertTrue(self.agent._best_action_settled(19))
+        self.assertFalse(self.agent._best_action_settled(20))
+
+    def test_search_with_playout_budget_is_reproducible(self):
+        root_statistics = []
+        for _ in range(2):
+            random.seed(0)
+            agent = MCTSAgent(0, False, playout_budget = 50)
+            agent.search(NestedTTT(None), 0)
+            self.assertEqual(agent.playout_total, 50)
+            root_statistics.append(agent.root_statistics())
+        self.assertEqual(root_statistics[0], root_statistics[1])
+
+    def test_node_limit_caps_tree_and_recycles_old_tree(self):
+        agent = MCTSAgent(0, False, max_nodes = 20)
+        game = NestedTTT(None)
+        action = agent.search(game, 0.05)
+        self.assertEqual(len(agent.node_pool), 20)
+
+        subtree_size = 0
+        nodes = [agent.root.get_child(action)]
+        while nodes:
+            node = nodes.pop()
+            nodes.extend(node.children.values())
+            subtree_size += 1
+        agent.take_action(action, True)
+        self.assertEqual(len(agent.node_pool), subtree_size)
+
+    def test_node_limit_full_before_root_expanded(self):
+        agent = MCTSAgent(0, False, max_nodes = 1)
+        game = NestedTTT(None)
+        self.assertIn(agent.search(game, 0.01), game.get_legal_actions())
+
+    def test_node_limit_with_transposition_table_raises(self):
+        with self.assertRaises(RuntimeError):
+            MCTSAgent(0, False, transposition_table_size = 10, max_nodes = 10)
+
+    def test_tree_stats_track_expansions(self):
+        game = NestedTTT(None)
+        self.agent.search(game, 0.05)
+        stats = self.agent.tree_stats()
+
+        num_nodes = 0
+        max_depth = 0
+        nodes = [(self.agent.root, 0)]
+        while nodes:
+            node, depth = nodes.pop()
+            nodes.extend([(child, depth + 1) for child in node.children.values()])
+            num_nodes += 1
+            max_depth = max(max_depth, depth)
+        self.assertEqual(stats["num_nodes"], num_nodes)
+        self.assertEqual(stats["max_depth"], max_depth)
+        self.assertGreater(stats["memory_bytes"], 0)
+
+    def test_iter_search_yields_snapshots_until_cancelled(self):
+        game = NestedTTT(None)
+        other_game = game.copy()
+        snapshots = self.agent.iter_search(game, 0.01)
+
+        playouts = []
+        for snapshot in snapshots:
+            self.assertIn(snapshot.action, game.get_legal_actions())
+            self.assertLessEqual(snapshot.visits, snapshot.playouts)
+            playouts.append(snapshot.playouts)
+            if len(playouts) == 3:
+                break
+        snapshots.close()
+
+        self.assertEqual(playouts, sorted(playouts))
+        self.assertEqual(self.agent.root.trials, playouts[-1])
+        self.assertEqual(game, other_game)
+
+    def test_leaf_playouts_backpropagated_together(self):
+        agent = MCTSAgent(0, False, leaf_playouts = 4)
+        game = NestedTTT(None)
+        agent.search(game, 0.05)
+        self.assertEqual(agent.root.trials, agent.playout_total)
+        self.assertEqual(agent.root.trials % 4, 0)
+        self.assertTrue(all([child.trials % 4 == 0 
+                                for child in agent.root.children.values()]))
+
+    def test_nonpositive_leaf_playouts_raises(self):
+        for leaf_playouts in [-1, 0]:
+            with self.assertRaises(RuntimeError):
+                MCTSAgent(0, False, leaf_playouts = leaf_playouts)
+
+    def test_playout_policy_learns_during_search(self):
+        agent = MCTSAgent(0, False, playout_policy = MASTPolicy())
+        game = NestedTTT(None)
+        other_game = game.copy()
+        agent.search(game, 0.05)
+        self.assertEqual(game, other_game)
+        self.assertTrue(any([trials for _, trials in agent.playout_policy.tables[0]]))
+
+        agent.take_action(game.get_legal_actions()[0], True)
+        self.assertIsNone(agent.playout_policy.tables)
+
+    def test_sequential_halving_spreads_budget_over_candidates(self):
+        agent = MCTSAgent(0, False, playout_budget = 500, 
+                            sequential_halving = 16)
+        game = NestedTTT(None)
+        other_game = game.copy()
+        action = agent.search(game, 1)
+
+        self.assertEqual(game, other_game)
+        self.assertIn(action, game.get_legal_actions())
+        self.assertEqual(len(agent.root.children), 16)
+        self.assertTrue(all([child.trials > 0 
+                                for child in agent.root.children.values()]))
+        self.assertEqual(agent.root.trials, agent.playout_total)
+        self.assertLessEqual(agent.playout_total, 500)
+
+    def test_sequential_halving_below_two_candidates_raises(self):
+        for num_candidates in [-1, 0, 1]:
+            with self.assertRaises(RuntimeError):
+                MCTSAgent(0, False, sequential_halving = num_candidates)
+
+    def test_sequential_halving_with_time_limit(self):
+        agent = MCTSAgent(0, False, sequential_halving = 16)
+        game = NestedTTT(None)
+        start_time = time()
+        action = agent.search(game, 0.1)
+        self.assertLess(time() - start_time, 0.5)
+        self.assertIn(action, game.get_legal_actions())
+        self.assertIsNone(agent.root_action)
@@ -0,0 +1,34 @@
+from unittest import TestCase
+
+from agents.mcts_agent import MCTSAgent
+from agents.node_pool import NodePool
+
+
+class TestNodePool(TestCase):
+
+    def setUp(self):
+        self.pool = NodePool(3, MCTSAgent.Node)
+
+    def test_nonpositive_size_raises(self):
+        with self.assertRaises(RuntimeError):
+            NodePool(0, MCTSAgent.Node)
+
+    def test_allocate_none_when_full(self):
+        nodes = [self.pool.allocate(None, 0) for _ in range(3)]
+        self.assertTrue(self.pool.is_full())
+        self.assertIsNone(self.pool.allocate(None, 0))
+        self.assertEqual(len(self.pool), len(nodes))
+
+    def test_release_reuses_subtree_nodes(self):
+        root = self.pool.allocate(None, None)
+        child = self.pool.allocate(root, 0)
+        child.trials = 5
+        root.add_child(0, child)
+
+        self.pool.release(root)
+        self.assertEqual(len(self.pool), 0)
+        reused = self.pool.allocate(None, 1)
+        self.assertIn(reused, [root, child])
+        self.assertEqual(reused.trials, 0)
+        self.assertFalse(reused.has_children())
+        self.assertEqual(reused.agent_id, 1)
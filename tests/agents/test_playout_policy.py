@@ -0,0 +1,70 @@
+import random
+from unittest import TestCase
+
+from agents.playout_policy import LastGoodReplyPolicy, MASTPolicy
+
+from games.ttt.nested_ttt import NestedTTT
+
+
+class TestMASTPolicy(TestCase):
+
+    def setUp(self):
+        self.policy = MASTPolicy(tournament_size = 4)
+        self.game = NestedTTT(None)
+        self.policy.prepare(self.game)
+
+    def test_nonpositive_tournament_size_raises(self):
+        with self.assertRaises(RuntimeError):
+            MASTPolicy(tournament_size = 0)
+
+    def test_update_counts_wins_of_each_agent(self):
+        actions = [self.game.action_from_index(40)]
+        self.game.take_action(actions[0])
+        actions.append(self.game.action_from_index(41))
+
+        self.policy.update(0, actions, 0, self.game.num_agents)
+        self.assertEqual(self.policy.tables[0][40], [1, 1])
+        self.assertEqual(self.policy.tables[1][41], [0, 1])
+        self.assertEqual(self.policy.tables[1][40], [0, 0])
+
+    def test_choose_action_prefers_higher_average(self):
+        table = self.policy.tables[0]
+        for entry in table:
+            entry[1] = 10
+        table[40][0] = 10
+
+        random.seed(0)
+        choices = [self.policy.choose_action(self.game).to_index() 
+                    for _ in range(200)]
+        uniform_count = len(choices) / self.game.num_legal_actions()
+        self.assertGreater(choices.count(40), 2 * uniform_count)
+
+    def test_clear_forgets_tables(self):
+        self.policy.clear()
+        self.assertIsNone(self.policy.tables)
+
+
+class TestLastGoodReplyPolicy(TestCase):
+
+    def setUp(self):
+        self.policy = LastGoodReplyPolicy()
+        self.game = NestedTTT(None)
+        self.policy.prepare(self.game)
+
+        self.first = self.game.action_from_index(40)
+        self.game.take_action(self.first)
+        self.reply = self.game.action_from_index(41)
+
+    def test_winning_reply_is_chosen(self):
+        self.policy.update(1, [self.first, self.reply], 0, self.game.num_agents)
+        self.assertEqual(self.policy.choose_action(self.game), self.reply)
+
+    def test_losing_reply_is_forgotten(self):
+        self.policy.update(1, [self.first, self.reply], 0, self.game.num_agents)
+        self.policy.update(0, [self.first, self.reply], 0, self.game.num_agents)
+        self.assertEqual(self.policy.tables[1][40], LastGoodReplyPolicy.NO_REPLY)
+
+    def test_illegal_reply_falls_back_to_random(self):
+        self.policy.tables[1][40] = 40
+        action = self.policy.choose_action(self.game)
+        self.assertTrue(self.game.is_legal_action(action))
@@ -0,0 +1,32 @@
+from time import time
+from unittest import TestCase
+
+from agents.root_parallel_mcts_agent import RootParallelMCTSAgent
+
+from games.ttt.nested_ttt import NestedTTT
+
+
+class TestRootParallelMCTSAgent(TestCase):
+
+    def setUp(self):
+        self.agent = RootParallelMCTSAgent(0, False, num_workers = 2)
+
+    def tearDown(self):
+        self.agent.shutdown()
+
+    def test_search_merges_worker_playouts(self):
+        game = NestedTTT(None)
+        action = self.agent.search(game, 0.1)
+        self.assertIn(action, game.get_legal_actions())
+        self.assertGreater(self.agent.playout_total, 0)
+        self.assertLessEqual(self.agent.action_statistics[0], 
+                                self.agent.playout_total)
+
+    def test_search_single_legal_action_skips_workers(self):
+        game = NestedTTT(None)
+        game.legal_positions = type(game.legal_positions)([((0, 0), (0, 0))])
+        start_time = time()
+        action = self.agent.search(game, 10)
+        self.assertLess(time() - start_time, 10)
+        self.assertEqual(self.agent.playout_total, 0)
+        self.assertIs(action, game.get_legal_actions()[0])
@@ -0,0 +1,38 @@
+from math import inf
+from unittest import TestCase
+
+from agents.time_manager import TimeManager
+
+from games.ttt.nested_ttt import NestedTTT
+
+
+class TestTimeManager(TestCase):
+
+    def setUp(self):
+        self.time_manager = TimeManager(10)
+
+    def test_nonpositive_time_bank_raises(self):
+        with self.assertRaises(RuntimeError):
+            TimeManager(0)
+
+    def test_move_time_shares_bank_across_remaining_moves(self):
+        game = NestedTTT(None)
+        self.assertAlmostEqual(self.time_manager.move_time(game, 5), 10 / 41)
+        self.assertEqual(TimeManager().move_time(game, 5), 5)
+
+    def test_spend_leaves_unused_time_in_bank(self):
+        self.time_manager.spend(4)
+        self.assertEqual(self.time_manager.remaining_bank, 6)
+        self.time_manager.spend(7)
+        self.assertEqual(self.time_manager.remaining_bank, 0)
+        self.time_manager.reset()
+        self.assertEqual(self.time_manager.remaining_bank, 10)
+
+    def test_remaining_playouts_from_rate(self):
+        self.assertEqual(TimeManager.remaining_playouts(100, 1, 3), 200)
+        self.assertEqual(TimeManager.remaining_playouts(0, 0, 3), inf)
+
+    def test_is_settled_compares_best_and_runner_up(self):
+        self.assertTrue(TimeManager.is_settled([5, 30, 10], 19))
+        self.assertFalse(TimeManager.is_settled([5, 30, 10], 20))
+        self.assertTrue(TimeManager.is_settled([30], 29))
@@ -0,0 +1,21 @@
+from unittest import TestCase
+
+from agents.transposition_table import TranspositionTable
+
+
+class TestTranspositionTable(TestCase):
+
+    def setUp(self):
+        self.table = TranspositionTable(2)
+
+    def test_get_missing_key_none(self):
+        self.assertIsNone(self.table.get(1))
+
+    def test_put_evicts_least_recently_used(self):
+        self.table.put(1, "a")
+        self.table.put(2, "b")
+        self.table.get(1)
+        self.table.put(3, "c")
+        self.assertEqual(len(self.table), 2)
+        self.assertEqual(self.table.get(1), "a")
+        self.assertIsNone(self.table.get(2))
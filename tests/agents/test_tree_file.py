@@ -0,0 +1,51 @@
+from os.path import join
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+from agents.mcts_agent import MCTSAgent
+from agents.tree_file import load_tree, save_tree
+
+from games.ttt.nested_ttt import NestedTTT
+
+
+class TestTreeFile(TestCase):
+
+    def setUp(self):
+        self.directory = TemporaryDirectory()
+        self.path = join(self.directory.name, "tree.npy")
+        self.game = NestedTTT(None)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_save_load_round_trip_within_max_depth(self):
+        agent = MCTSAgent(0, False)
+        agent.search(self.game, 0.05)
+        save_tree(self.path, agent.root, 1)
+
+        root = load_tree(self.path, self.game, MCTSAgent.Node)
+        self.assertEqual(len(self.game.action_history), 0)
+        self.assertEqual(root.trials, agent.root.trials)
+        self.assertEqual(set(root.children), set(agent.root.children))
+        for action, child in root.children.items():
+            saved_child = agent.root.get_child(action)
+            self.assertEqual((child.trials, child.wins, child.agent_id), 
+                                (saved_child.trials, saved_child.wins, 
+                                    saved_child.agent_id))
+            self.assertFalse(child.has_children())
+        self.assertEqual(root.subtree_size, len(root.children) + 1)
+        self.assertEqual(root.height, 1)
+
+    def test_agent_warm_starts_from_previous_game(self):
+        agent = MCTSAgent(0, False, tree_file = self.path)
+        action = agent.search(self.game, 0.05)
+        agent.take_action(action, True)
+        agent.reset()
+
+        new_agent = MCTSAgent(1, False, tree_file = self.path)
+        new_agent.reset()
+        self.game.take_action(action)
+        new_agent.take_action(action, False)
+        new_agent.search(self.game, 0.01)
+        self.assertGreater(new_agent.root.trials, new_agent.playout_total)
+        self.assertIsNotNone(new_agent.opening_root.get_child(action))
@@ -0,0 +1,36 @@
+from time import time
+from unittest import TestCase
+
+from agents.tree_parallel_mcts_agent import TreeParallelMCTSAgent
+
+from games.ttt.nested_ttt import NestedTTT
+
+
+class TestTreeParallelMCTSAgent(TestCase):
+
+    def setUp(self):
+        self.agent = TreeParallelMCTSAgent(0, False, num_threads = 4)
+
+    def test_search_removes_all_virtual_loss(self):
+        game = NestedTTT(None)
+        action = self.agent.search(game, 0.1)
+        self.assertIn(action, game.get_legal_actions())
+
+        root = self.agent.root
+        self.assertEqual(root.trials, self.agent.playout_total)
+        self.assertEqual(root.trials, 
+                            sum([child.trials for child in root.children.values()]))
+
+    def test_search_records_search_time(self):
+        self.agent.search(NestedTTT(None), 0.05)
+        self.assertGreater(self.agent.search_time, 0)
+        self.assertIn("/s", str(self.agent))
+
+    def test_search_single_legal_action_skips_threads(self):
+        game = NestedTTT(None)
+        game.legal_positions = type(game.legal_positions)([((0, 0), (0, 0))])
+        start_time = time()
+        action = self.agent.search(game, 10)
+        self.assertLess(time() - start_time, 10)
+        self.assertEqual(self.agent.playout_total, 0)
+        self.assertIs(action, game.get_legal_actions()[0])
@@ -1,3 +1,5 @@
+from pickle import dumps, loads
+from random import Random
 from unittest import TestCase
 
 
@@ -18,3 +20,95 @@ class GameTestCase(TestCase):
 
         other_game.take_action(self.test_action)
         self.assertEqual(self.game, other_game)
+
+    def _test_copy_into_matches_copy(self):
+        rng = Random(0)
+        dest = self.game.copy()
+        for _ in range(5):
+            dest.take_action(dest.random_legal_action(rng))
+        for _ in range(3):
+            self.game.take_action(self.game.random_legal_action(rng))
+
+        self.game.copy_into(dest)
+        self.assertEqual(dest, self.game)
+        self.assertEqual(dest.zobrist_key, self.game.zobrist_key)
+        self.assertEqual(dest.get_legal_actions(), self.game.get_legal_actions())
+
+        original_game = self.game.copy()
+        dest.take_action(dest.random_legal_action(rng))
+        self.assertEqual(self.game, original_game)
+        dest.rewind(0)
+        self.assertEqual(dest, type(self.game)(None))
+
+    def _test_undo_action_restores_state(self):
+        original_game = self.game.copy()
+        states = []
+        while not self.game.is_terminal():
+            states.append(self.game.copy())
+            self.game.take_action(self.game.generate_random_action())
+
+        while states:
+            self.game.undo_action()
+            state = states.pop()
+            self.assertEqual(self.game, state)
+            self.assertEqual(self.game.zobrist_key, state.zobrist_key)
+        self.assertEqual(self.game, original_game)
+
+    def _test_zobrist_key_transposition(self, actions):
+        """
+        The actions are applied in the given order and in reverse order, 
+        which must reach the same state.
+        """
+        other_game = self.game.copy()
+        initial_key = self.game.zobrist_key
+        for action in actions:
+            self.game.take_action(action)
+        for action in reversed(actions):
+            other_game.take_action(action)
+
+        self.assertNotEqual(self.game.zobrist_key, initial_key)
+        self.assertEqual(self.game.zobrist_key, other_game.zobrist_key)
+        self.assertEqual(hash(self.game), hash(other_game))
+
+    def _test_legal_actions_cached_until_action(self):
+        legal_actions = self.game.get_legal_actions()
+        self.assertIs(self.game.get_legal_actions(), legal_actions)
+        self.assertEqual(self.game.num_legal_actions(), len(legal_actions))
+
+        self.game.take_action(self.test_action)
+        self.assertNotIn(self.test_action, self.game.get_legal_actions())
+        self.assertEqual(self.game.num_legal_actions(), 
+                            len(self.game.get_legal_actions()))
+
+        self.game.undo_action()
+        self.assertEqual(set(self.game.get_legal_actions()), set(legal_actions))
+
+    def _test_random_legal_action_is_legal(self):
+        rng = Random(0)
+        while not self.game.is_terminal():
+            action = self.game.random_legal_action(rng)
+            self.assertIn(action, self.game.get_legal_actions())
+            self.game.take_action(action)
+        self.assertEqual(self.game.num_legal_actions(), 0)
+
+    def _test_ordered_legal_actions_are_legal_actions(self):
+        self.game.take_action(self.game.get_legal_actions()[0])
+        self.assertCountEqual(self.game.ordered_legal_actions(), 
+                                self.game.get_legal_actions())
+
+    def _test_action_index_round_trip(self):
+        indices = set()
+        for action in self.game.get_legal_actions():
+            index = action.to_index()
+            self.assertTrue(0 <= index < self.game.ACTION_SPACE_SIZE)
+            self.assertEqual(self.game.action_from_index(index), action)
+            indices.add(index)
+        self.assertEqual(len(indices), self.game.num_legal_actions())
+
+    def _test_actions_interned(self):
+        action = self.game.action_from_index(self.test_action.to_index())
+        self.assertIs(action, self.test_action)
+        self.assertIs(self.game.copy().action_from_index(action.to_index()), action)
+        self.assertIs(loads(dumps(action)), action)
+        with self.assertRaises(AttributeError):
+            setattr(action, action.__slots__[0], None)
@@ -20,3 +20,36 @@ class TestHavannah(GameTestCase):
 
     def test_game_equality(self):
         self._test_game_equality()
+
+    def test_undo_action_restores_state(self):
+        self._test_undo_action_restores_state()
+
+    def test_zobrist_key_transposition(self):
+        self._test_zobrist_key_transposition(
+            [HavannahAction((0, 0, 0), Color.BLUE), 
+                HavannahAction((1, -1, 0), Color.RED),
+                HavannahAction((2, -1, -1), Color.BLUE)])
+
+    def test_legal_actions_cached_until_action(self):
+        self._test_legal_actions_cached_until_action()
+
+    def test_random_legal_action_is_legal(self):
+        self._test_random_legal_action_is_legal()
+
+    def test_action_index_round_trip(self):
+        self._test_action_index_round_trip()
+
+    def test_ordered_legal_actions_are_legal_actions(self):
+        self._test_ordered_legal_actions_are_legal_actions()
+
+    def test_ordered_legal_actions_start_next_to_stones(self):
+        self.game.take_action(self.test_action)
+        first_action = self.game.ordered_legal_actions()[0]
+        self.assertIn(first_action.coord, 
+                        self.game.board.grid[self.test_action.coord].neighbors)
+
+    def test_copy_into_matches_copy(self):
+        self._test_copy_into_matches_copy()
+
+    def test_actions_interned(self):
+        self._test_actions_interned()
@@ -88,3 +88,17 @@ class TestHavannahBoard(TestCase):
             # take action checks for rings
             self.board.take_action(HavannahAction(coord, Color.BLUE))
         self.assertEqual(self.board.winner, Color.BLUE)
+
+    def test_undo_action_reverts_ring_win(self):
+        coords = [(1, 0, -1), (0, 1, -1), (-1, 1, 0), (-1, 0, 1),
+                    (0, -1, 1), (1, -1, 0)]
+        for coord in coords[:-1]:
+            self.board.take_action(HavannahAction(coord, Color.BLUE))
+        other_board = deepcopy(self.board)
+
+        last_action = HavannahAction(coords[-1], Color.BLUE)
+        self.board.take_action(last_action)
+        self.assertEqual(self.board.winner, Color.BLUE)
+
+        self.board.undo_action(last_action)
+        self.assertEqual(self.board, other_board)
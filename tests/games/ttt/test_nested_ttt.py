@@ -40,3 +40,40 @@ class TestNestedTTT(GameTestCase):
 
     def test_game_equality(self):
         self._test_game_equality()
+
+    def test_undo_action_restores_state(self):
+        self._test_undo_action_restores_state()
+
+    def test_zobrist_key_transposition(self):
+        self._test_zobrist_key_transposition(
+            [TTTAction((0, 0), (0, 0), TTTMove.X), 
+                TTTAction((1, 1), (0, 0), TTTMove.O),
+                TTTAction((2, 2), (1, 1), TTTMove.X)])
+
+    def test_legal_actions_cached_until_action(self):
+        self._test_legal_actions_cached_until_action()
+
+    def test_random_legal_action_is_legal(self):
+        self._test_random_legal_action_is_legal()
+
+    def test_action_index_round_trip(self):
+        self._test_action_index_round_trip()
+
+    def test_action_index_matches_row_major_order(self):
+        action = TTTAction((1, 2), (0, 1), TTTMove.X)
+        self.assertEqual(action.to_index(), 1 * 27 + 2 * 9 + 0 * 3 + 1)
+
+    def test_ordered_legal_actions_are_legal_actions(self):
+        self._test_ordered_legal_actions_are_legal_actions()
+
+    def test_ordered_legal_actions_start_with_inner_centers(self):
+        ordered_actions = self.game.ordered_legal_actions()
+        self.assertTrue(all([action.inner_pos == (1, 1) 
+                                for action in ordered_actions[:9]]))
+        self.assertEqual(ordered_actions[-1].inner_pos, (2, 1))
+
+    def test_copy_into_matches_copy(self):
+        self._test_copy_into_matches_copy()
+
+    def test_actions_interned(self):
+        self._test_actions_interned()
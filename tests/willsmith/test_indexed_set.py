@@ -0,0 +1,33 @@
+from copy import copy
+from random import Random
+from unittest import TestCase
+
+from willsmith.indexed_set import IndexedSet
+
+
+class TestIndexedSet(TestCase):
+
+    def setUp(self):
+        self.items = IndexedSet(range(5))
+
+    def test_remove_keeps_remaining_items(self):
+        self.items.remove(1)
+        self.assertEqual(set(self.items), {0, 2, 3, 4})
+        self.assertNotIn(1, self.items)
+        self.assertEqual(len(self.items), 4)
+
+    def test_remove_missing_item_raises(self):
+        self.assertRaises(KeyError, self.items.remove, 5)
+
+    def test_add_after_remove_restores_set(self):
+        other_items = copy(self.items)
+        self.items.remove(0)
+        self.assertNotEqual(self.items, other_items)
+        self.items.add(0)
+        self.assertEqual(self.items, other_items)
+
+    def test_choice_returns_member(self):
+        rng = Random(0)
+        self.items.remove(2)
+        for _ in range(20):
+            self.assertIn(self.items.choice(rng), self.items)
@@ -0,0 +1,68 @@
+from pickle import dumps, loads
+from threading import Lock
+from unittest import TestCase
+
+from agents.random_agent import RandomAgent
+
+from games.ttt.nested_ttt import NestedTTT
+
+from willsmith.simulator import Simulator
+from willsmith.state_view import StateView
+
+
+class TestStateView(TestCase):
+
+    def setUp(self):
+        self.game = NestedTTT(None)
+        self.game.take_action(self.game.get_legal_actions()[0])
+        self.view = StateView(self.game)
+
+    def test_view_reads_game(self):
+        self.assertEqual(self.view.current_agent_id, self.game.current_agent_id)
+        self.assertEqual(self.view.get_legal_actions(), self.game.get_legal_actions())
+        self.assertEqual(self.view.action_history, tuple(self.game.action_history))
+        self.assertEqual(self.view.zobrist_key, self.game.zobrist_key)
+        self.assertFalse(self.view.is_terminal())
+
+    def test_copy_is_private(self):
+        other_game = self.game.copy()
+        state = self.view.copy()
+        state.take_action(state.get_legal_actions()[0])
+        self.assertEqual(self.game, other_game)
+        self.assertFalse(hasattr(self.view, "take_action"))
+
+    def test_closed_view_raises(self):
+        self.view.close()
+        with self.assertRaises(RuntimeError):
+            self.view.get_legal_actions()
+
+    def test_pickled_view_reads_copy(self):
+        self.game.display = Lock()  # unpicklable, like a GUI display
+        view = loads(dumps(self.view))
+        self.assertIsNot(view.game, self.game)
+        self.assertEqual(view.game, self.game)
+
+
+class ViewRecordingAgent(RandomAgent):
+
+    def search(self, state, allotted_time):
+        self.states.append(state)
+        return super().search(state, allotted_time)
+
+    def _reset(self):
+        self.states = []
+
+
+class TestSimulatorStateViews(TestCase):
+
+    def test_agents_search_closed_views(self):
+        game = NestedTTT(None)
+        agents = [ViewRecordingAgent(0, None), ViewRecordingAgent(1, None)]
+        Simulator._run_game(game, agents, 0)
+
+        states = agents[0].states + agents[1].states
+        self.assertEqual(len(states), len(game.action_history))
+        for state in states:
+            self.assertIsInstance(state, StateView)
+            with self.assertRaises(RuntimeError):
+                state.is_terminal()
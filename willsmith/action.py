@@ -11,10 +11,20 @@ class Action(ABC):
 
     The parse_action method is used to convert strings to the action subclass, 
     and the INPUT_PROMPT attribute is used to convey the format to a user.
+
+    The to_index method encodes the action as a dense integer in the range 
+    [0, ACTION_SPACE_SIZE) of its game, see Game.action_from_index.
+
+    Actions are used as dictionary keys by agents, so they should not change 
+    after they are created.  Subclasses can intern their instances, so that 
+    each distinct action is a single object shared by every copy of every 
+    state, and compare them by identity.
     """
 
     INPUT_PROMPT = None
 
+    __slots__ = ()
+
     def __init__(self):
         if self.INPUT_PROMPT is None:
             raise RuntimeError("Actions must set an input prompt.")
@@ -28,6 +38,17 @@ class Action(ABC):
         """
         pass
 
+    @abstractmethod
+    def to_index(self):
+        """
+        Return the integer encoding of the action.
+
+        The encoding only identifies the position of the action, actions of 
+        different players at the same position share an index.  Used to 
+        store per-action data in flat arrays instead of dictionaries.
+        """
+        pass
+
     @abstractmethod
     def __eq__(self, other):
         """
@@ -39,6 +60,8 @@ class Action(ABC):
         isinstance(self, other.__class__) should be used to ensure equality 
         tests of different classes return False instead of raising an 
         AttributeError
+
+        Interned actions can use object.__eq__ instead.
         """
         pass
 
@@ -51,6 +74,6 @@ class Action(ABC):
         implementation.
 
         A simple default is to create a tuple of the instance attributes and 
-        call hash() on it.
+        call hash() on it.  Interned actions can use object.__hash__ instead.
         """
         pass
@@ -1,4 +1,14 @@
 from abc import ABC, abstractmethod
+from collections import namedtuple
+
+
+SearchSnapshot = namedtuple("SearchSnapshot", 
+                            ["action", "visits", "value", "playouts"])
+SearchSnapshot.__doc__ = """
+The best action found so far by an anytime search, with the number of 
+visits to it, its estimated value, and the number of playouts run in the 
+search so far.  Agents that do not track a statistic leave it as None.
+"""
 
 
 class Agent(ABC):
@@ -35,9 +45,24 @@ class Agent(ABC):
         Search the action space for the next action to take.  
 
         Search strategy depends on the subclass implementation.
+
+        Simulator passes the state as a read-only StateView, see 
+        willsmith.state_view.  Agents that take actions on the state while 
+        searching must search a copy of it.
         """
         pass
 
+    def iter_search(self, state, interval):
+        """
+        Search the action space, yielding a SearchSnapshot of the best action 
+        so far after every interval seconds, until the caller stops 
+        iterating.
+
+        Subclasses with an anytime search should override this.  By default 
+        a single search of interval seconds is run and its action yielded.
+        """
+        yield SearchSnapshot(self.search(state, interval), None, None, None)
+
     @abstractmethod
     def _take_action(self, action):
         """
@@ -46,6 +71,18 @@ class Agent(ABC):
         """
         pass
 
+    def ponder(self, state):
+        """
+        Use the time while another agent is searching from the state, which 
+        is passed as a read-only StateView by Simulator.  It is only valid 
+        during the call, agents that keep searching copy it.
+
+        Called by Simulator at the start of every other agent's turn, the 
+        next call to take_action ends the turn.  Agents that do not ponder 
+        ignore it.
+        """
+        pass
+
     def take_action(self, action, is_my_action):
         if is_my_action and self.display is not None:
             self.display.update_display(self, action)
@@ -1,10 +1,12 @@
 from abc import ABC, abstractmethod
-from copy import deepcopy
-from random import choice
+from copy import copy, deepcopy
+import random
 
 from willsmith.action import Action
 from willsmith.display_controller import DisplayController
 from willsmith.simple_displays import ConsoleDisplay, NoDisplay
+from willsmith.zobrist import (TURN_SEED, generate_zobrist_keys, 
+                                generate_zobrist_table)
 
 
 class Game(ABC):
@@ -24,14 +26,30 @@ class Game(ABC):
     The NUM_PLAYERS class attribute is required to set the number of agents 
     expected for the game.
 
+    The ACTION_SPACE_SIZE class attribute is required to set the number of 
+    distinct action indices, see Action.to_index.
+
     The DISPLAY class attribute is required to set the display for the 
     simulator to use.
+
+    Legal actions are cached between actions, get_legal_actions returns the 
+    same tuple until the next action is taken or undone.  Subclasses can 
+    override _num_legal_actions and _random_legal_action to answer those 
+    queries without building the list of actions at all.
+
+    The zobrist_key attribute is a 64-bit key identifying the state, kept up 
+    to date incrementally.  The game tracks the agent to move, subclasses 
+    XOR in and out the zobrist_table entry for each action in _take_action 
+    and _undo_action.  See willsmith.zobrist.
     """
 
     ACTION = None
+    ACTION_SPACE_SIZE = None
     DISPLAY = None
     NUM_PLAYERS = None
 
+    _zobrist_tables = dict()    # (num players, action space size) : table
+
     def __init__(self, use_display):
         """
         Start the game with the first player and sets the number of agents 
@@ -42,6 +60,8 @@ class Game(ABC):
         """
         self.num_agents = self.NUM_PLAYERS
         self.current_agent_id = 0
+        self.action_history = []
+        self._legal_actions_cache = None
 
         self.display = NoDisplay()
         if use_display is not None:
@@ -56,16 +76,59 @@ class Game(ABC):
             raise RuntimeError("Game must set its own action, which must subclass Action.")
         if self.NUM_PLAYERS is None:
             raise RuntimeError("Game must set expected number of players.")
+        if self.ACTION_SPACE_SIZE is None:
+            raise RuntimeError("Game must set the size of its action space.")
+
+        self.turn_keys = generate_zobrist_keys(self.NUM_PLAYERS, TURN_SEED)
+        self.zobrist_table = self._get_zobrist_table()
+        self.zobrist_key = self.turn_keys[self.current_agent_id]
 
     def get_legal_actions(self):
         """
-        Return a list of the legal actions remaining in the game, unless the 
-        game is in a terminal state.  Then return an empty list.
+        Return a tuple of the legal actions remaining in the game, unless the 
+        game is in a terminal state.  Then return an empty tuple.
+
+        The result is cached until the state changes.
+        """
+        if self._legal_actions_cache is None:
+            results = ()
+            if not self.is_terminal():
+                results = tuple(self._get_legal_actions())
+            self._legal_actions_cache = results
+        return self._legal_actions_cache
+
+    def num_legal_actions(self):
+        """
+        Return the number of legal actions remaining in the game, which is 0 
+        in a terminal state.
         """
-        results = []
+        num_actions = 0
         if not self.is_terminal():
-            results = self._get_legal_actions()
-        return results
+            num_actions = self._num_legal_actions()
+        return num_actions
+
+    def random_legal_action(self, rng):
+        """
+        Return a random choice of the legal actions, using the given 
+        random.Random instance.
+
+        Raises an IndexError in a terminal state.
+        """
+        if self.is_terminal():
+            raise IndexError("No legal actions in a terminal state.")
+        return self._random_legal_action(rng)
+
+    def ordered_legal_actions(self):
+        """
+        Return the legal actions ordered from most to least promising by a 
+        cheap move-ordering heuristic.
+
+        Used by agents that only consider some of the legal actions at first, 
+        such as MCTSAgent with progressive widening.  Subclasses should 
+        override this with a heuristic for their game, by default the actions 
+        are in no particular order.
+        """
+        return self.get_legal_actions()
 
     def take_action(self, action):
         """
@@ -76,12 +139,44 @@ class Game(ABC):
             raise RuntimeError("Received illegal action: {}".format(action))
 
         self._take_action(action)
+        self.action_history.append(action)
+        self._legal_actions_cache = None
         self._increment_current_agent_id()
         if self.display is not None:    # display is None in copies
             self.display.update_display(self, action)
 
+    def undo_action(self):
+        """
+        Revert the most recent action taken in the game, returning the game 
+        to the exact state it was in before that action, and return the 
+        action.
+
+        Allows agents to walk down and back up a single state during search 
+        instead of copying the state for every playout.  The display is not 
+        updated, undoing is intended for the display-less copies agents 
+        receive.
+        """
+        if not self.action_history:
+            raise RuntimeError("No actions to undo.")
+
+        action = self.action_history.pop()
+        self._legal_actions_cache = None
+        self._decrement_current_agent_id()
+        self._undo_action(action)
+        return action
+
+    def rewind(self, num_actions):
+        """
+        Undo actions until only num_actions actions remain in the history.
+        """
+        while len(self.action_history) > num_actions:
+            self.undo_action()
+
     def reset(self):
         self.current_agent_id = 0
+        self.action_history = []
+        self._legal_actions_cache = None
+        self.zobrist_key = self.turn_keys[self.current_agent_id]
         self._reset()
 
         if self.display is not None:    # display is None in copies
@@ -102,6 +197,33 @@ class Game(ABC):
         """
         pass
 
+    def _num_legal_actions(self):
+        """
+        Return the number of available actions for the current agent.
+
+        Subclasses should override this when they can count their actions 
+        without generating them.
+        """
+        return len(self.get_legal_actions())
+
+    def _random_legal_action(self, rng):
+        """
+        Return a random choice of the available actions for the current 
+        agent.
+
+        Subclasses should override this when they can choose an action 
+        without generating all of them.
+        """
+        return rng.choice(self.get_legal_actions())
+
+    @abstractmethod
+    def action_from_index(self, index):
+        """
+        Return the action of the current agent with the given index, the 
+        inverse of Action.to_index.
+        """
+        pass
+
     @abstractmethod
     def is_legal_action(self, action):
         """
@@ -116,6 +238,23 @@ class Game(ABC):
 
         Overriden version of this method should be decorated with 
         progress_game to ensure the current_agent_id attribute remains valid.
+
+        The zobrist_table entry for the current agent and the action's index 
+        should be XORed into zobrist_key.
+        """
+        pass
+
+    @abstractmethod
+    def _undo_action(self, action):
+        """
+        Revert the internal game state by the given action, which is always 
+        the most recent action taken.
+
+        current_agent_id has already been reverted to the agent that took the 
+        action when this is called.
+
+        The zobrist_table entry for the current agent and the action's index 
+        should be XORed out of zobrist_key.
         """
         pass
 
@@ -141,7 +280,7 @@ class Game(ABC):
 
         Used by random agents or for game playouts by other agents.
         """
-        random_action = choice(self.get_legal_actions())
+        random_action = self.random_legal_action(random)
         return random_action
 
     def copy(self):
@@ -153,19 +292,81 @@ class Game(ABC):
         """
         return deepcopy(self)
 
+    def copy_into(self, dest):
+        """
+        Overwrite dest, another state of the same game, with this state and 
+        return it.
+
+        Unlike copy, the objects of dest are reused rather than allocated 
+        again, so agents can keep scratch states around and refill them 
+        from each new state they search.  As with copy, the display is not 
+        copied.
+        """
+        if not isinstance(dest, self.__class__):
+            raise RuntimeError("Can only copy into a state of the same game.")
+
+        dest.num_agents = self.num_agents
+        dest.current_agent_id = self.current_agent_id
+        dest.action_history[:] = self.action_history
+        dest._legal_actions_cache = None
+        dest.turn_keys = self.turn_keys
+        dest.zobrist_table = self.zobrist_table
+        dest.zobrist_key = self.zobrist_key
+        dest.display = None
+        self._copy_into(dest)
+        return dest
+
+    @abstractmethod
+    def _copy_into(self, dest):
+        """
+        Overwrite the subclass's state attributes of dest with copies of its 
+        own, reusing the objects dest already has.
+        """
+        pass
+
+    @classmethod
+    def _get_zobrist_table(cls):
+        """
+        Return the Zobrist table for the game, a list indexed by agent id of 
+        lists of 64-bit keys indexed by action index.
+
+        Tables are generated once and shared between games.
+        """
+        table_key = (cls.NUM_PLAYERS, cls.ACTION_SPACE_SIZE)
+        if table_key not in cls._zobrist_tables:
+            cls._zobrist_tables[table_key] = generate_zobrist_table(*table_key)
+        return cls._zobrist_tables[table_key]
+
     def _increment_current_agent_id(self):
         """
         Increment the agent id of the current player, indicating a new turn.
 
         This method forces the id to stay in legal range [0, num_agents)
         """
+        self.zobrist_key ^= self.turn_keys[self.current_agent_id]
         self.current_agent_id += 1
         if self.current_agent_id == self.num_agents:
             self.current_agent_id = 0
+        self.zobrist_key ^= self.turn_keys[self.current_agent_id]
+
+    def _decrement_current_agent_id(self):
+        """
+        Decrement the agent id of the current player, reverting a turn.
+
+        This method forces the id to stay in legal range [0, num_agents)
+        """
+        self.zobrist_key ^= self.turn_keys[self.current_agent_id]
+        self.current_agent_id -= 1
+        if self.current_agent_id < 0:
+            self.current_agent_id = self.num_agents - 1
+        self.zobrist_key ^= self.turn_keys[self.current_agent_id]
 
     def __eq__(self, other):
         return self.num_agents == other.num_agents and self.current_agent_id == other.current_agent_id
 
+    def __hash__(self):
+        return self.zobrist_key
+
     def deepcopy_game_attrs(self, new):
         """
         Used by subclasses to copy over the game attributes to a new deepcopy 
@@ -176,5 +377,10 @@ class Game(ABC):
         """
         new.num_agents = self.num_agents
         new.current_agent_id = self.current_agent_id
+        new.action_history = copy(self.action_history)
+        new._legal_actions_cache = None
+        new.turn_keys = self.turn_keys
+        new.zobrist_table = self.zobrist_table
+        new.zobrist_key = self.zobrist_key
         new.display = None
         return new
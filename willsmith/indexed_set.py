@@ -0,0 +1,70 @@
+from copy import copy
+
+
+class IndexedSet:
+    """
+    A set that also supports constant time random selection of its items.
+
+    Items are stored in a list alongside a dictionary from each item to its 
+    index in the list.  Removal swaps the last item of the list into the 
+    removed item's place, so adding, removing, membership testing, and 
+    random selection are all constant time.
+
+    Used by games to store their remaining legal positions, so that random 
+    playouts do not need to build a list of actions on every turn.
+    """
+
+    def __init__(self, items = ()):
+        self._items = list(items)
+        self._indices = {item : i for i, item in enumerate(self._items)}
+
+    def add(self, item):
+        if item not in self._indices:
+            self._indices[item] = len(self._items)
+            self._items.append(item)
+
+    def remove(self, item):
+        """
+        Remove the item, raising a KeyError if it is not in the set.
+        """
+        index = self._indices.pop(item)
+        last_item = self._items.pop()
+        if index < len(self._items):
+            self._items[index] = last_item
+            self._indices[last_item] = index
+
+    def choice(self, rng):
+        """
+        Return a random item using the given random.Random instance.
+        """
+        return self._items[rng.randrange(len(self._items))]
+
+    def __contains__(self, item):
+        return item in self._indices
+
+    def __iter__(self):
+        return iter(self._items)
+
+    def __len__(self):
+        return len(self._items)
+
+    def __eq__(self, other):
+        equal = False
+        if isinstance(self, other.__class__):
+            equal = self._indices.keys() == other._indices.keys()
+        return equal
+
+    def copy_into(self, dest):
+        """
+        Overwrite the items of another IndexedSet with the items of this one, 
+        reusing its list and dictionary.
+        """
+        dest._items[:] = self._items
+        dest._indices.clear()
+        dest._indices.update(self._indices)
+
+    def __copy__(self):
+        new = IndexedSet.__new__(IndexedSet)
+        new._items = copy(self._items)
+        new._indices = copy(self._indices)
+        return new
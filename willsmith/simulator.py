@@ -1,4 +1,7 @@
 from logging import getLogger
+import random
+
+from willsmith.state_view import StateView
 
 
 class Simulator:
@@ -9,13 +12,21 @@ class Simulator:
         pass
 
     @staticmethod
-    def run_games(game, agents, time_allowed, num_games):
+    def run_games(game, agents, time_allowed, num_games, seed = None):
         """
         Run num_games number of game simulations.
+
+        If a seed is given, the random module is seeded with it first, so 
+        that games between agents using fixed playout budgets are 
+        reproducible.
         """
         if len(agents) != game.NUM_PLAYERS:
             raise RuntimeError("Incorrect number of agents for game type.")
 
+        if seed is not None:
+            random.seed(seed)
+            getLogger(__name__).debug("Random seed {}".format(seed))
+
         for i in range(num_games):
             getLogger(__name__).info("Game {}/{}".format(i + 1, num_games))
             Simulator._run_game(game, agents, time_allowed)
@@ -25,6 +36,12 @@ class Simulator:
     @staticmethod
     def _run_game(game, agents, time_allowed):
         """
+        Play a game between the agents.
+
+        On each turn the agents are shown the game through one read-only 
+        StateView, rather than each getting a copy, and agents that need to 
+        change the state copy it themselves.  The view is closed before the 
+        action is taken.
         """
         game.reset()
         for agent in agents:
@@ -33,7 +50,12 @@ class Simulator:
 
         while not game.is_terminal():
             current_agent = agents[game.current_agent_id]
-            action = current_agent.search(game.copy(), time_allowed)
+            view = StateView(game)
+            for agent in agents:
+                if agent is not current_agent:
+                    agent.ponder(view)
+            action = current_agent.search(view, time_allowed)
+            view.close()
             getLogger(__name__).debug("Agent {} {}".format(current_agent.agent_id, current_agent))
             Simulator._advance_by_action(game, agents, action)
 
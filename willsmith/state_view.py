@@ -0,0 +1,97 @@
+class StateView:
+    """
+    A read-only view of a game state.
+
+    Used by Simulator to show agents the state of the game without copying
+    it on every turn.  The view answers the queries of the Game API that do
+    not change the state, by reading the game itself.  Agents that need to
+    take actions on the state, such as searching agents, ask for their own
+    copy with copy or copy_into, and the game is only copied then.
+
+    A view is only valid until the game changes.  Simulator closes it once
+    the agents' calls return, after which using it raises a RuntimeError.
+    """
+
+    def __init__(self, game):
+        self._game = game
+        self.ACTION = game.ACTION
+        self.ACTION_SPACE_SIZE = game.ACTION_SPACE_SIZE
+        self.NUM_PLAYERS = game.NUM_PLAYERS
+
+    def close(self):
+        self._game = None
+
+    @property
+    def game(self):
+        if self._game is None:
+            raise RuntimeError("State view used after the game changed.")
+        return self._game
+
+    @property
+    def current_agent_id(self):
+        return self.game.current_agent_id
+
+    @property
+    def num_agents(self):
+        return self.game.num_agents
+
+    @property
+    def action_history(self):
+        """
+        The actions taken so far, as a tuple.
+        """
+        return tuple(self.game.action_history)
+
+    @property
+    def zobrist_key(self):
+        return self.game.zobrist_key
+
+    def get_legal_actions(self):
+        return self.game.get_legal_actions()
+
+    def num_legal_actions(self):
+        return self.game.num_legal_actions()
+
+    def random_legal_action(self, rng):
+        return self.game.random_legal_action(rng)
+
+    def generate_random_action(self):
+        return self.game.generate_random_action()
+
+    def ordered_legal_actions(self):
+        return self.game.ordered_legal_actions()
+
+    def action_from_index(self, index):
+        return self.game.action_from_index(index)
+
+    def is_legal_action(self, action):
+        return self.game.is_legal_action(action)
+
+    def get_winning_id(self):
+        return self.game.get_winning_id()
+
+    def is_terminal(self):
+        return self.game.is_terminal()
+
+    def copy(self):
+        """
+        Return a private copy of the game, which the agent may change.
+        """
+        return self.game.copy()
+
+    def copy_into(self, dest):
+        """
+        Overwrite dest with the game, see Game.copy_into.
+        """
+        return self.game.copy_into(dest)
+
+    def __reduce__(self):
+        """
+        Pickle views as views of a copy of the game, for agents that search 
+        in other processes.  The copy leaves out the game's display, which 
+        may not be picklable.
+        """
+        return (StateView, (self.game.copy(),))
+
+    def __str__(self):
+        return str(self.game)
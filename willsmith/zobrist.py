@@ -0,0 +1,36 @@
+"""
+Zobrist hashing support for game states.
+
+A Zobrist table assigns a random 64-bit integer to every (player, action) 
+pair of a game.  The key of a state is the XOR of the entries for every 
+action taken, so taking or undoing an action updates the key in constant 
+time by XORing in the entry for that action.
+
+Tables are generated from a fixed seed so that keys are stable across 
+processes, allowing them to be stored alongside search results.
+"""
+
+
+from random import Random
+
+
+ZOBRIST_SEED = 20180101
+TURN_SEED = 20180102
+
+
+def generate_zobrist_keys(num_keys, seed = ZOBRIST_SEED):
+    """
+    Return a list of num_keys random 64-bit integers.
+    """
+    rng = Random(seed)
+    return [rng.getrandbits(64) for _ in range(num_keys)]
+
+def generate_zobrist_table(num_players, action_space_size, 
+                            seed = ZOBRIST_SEED):
+    """
+    Return a list, indexed by agent id, of lists of keys indexed by action 
+    index.
+    """
+    keys = generate_zobrist_keys(num_players * action_space_size, seed)
+    return [keys[i * action_space_size:(i + 1) * action_space_size]
+                for i in range(num_players)]